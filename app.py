@@ -1,21 +1,57 @@
-import io
-import re
+import functools
+import html
+import string
+import time
 import warnings
-from pathlib import Path
 from datetime import datetime
-from typing import Optional
 
-import numpy as np
 import pandas as pd
 import streamlit as st
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
+
+from netflix_recommender import core
+from netflix_recommender.ann import ANN_RECALL_K, ANN_RECALL_TARGET, IVFIndex
+from netflix_recommender.cache import ResultCache
+from netflix_recommender.metrics import REGISTRY, metrics_path
+from netflix_recommender.titles import TITLE_OPTIONS_LIMIT, TitleIndex
+from netflix_recommender.dense import (
+    DENSE_RECALL_K,
+    DENSE_RECALL_TARGET,
+    DenseModel,
+    load_dense_model,
+    save_dense_model,
+)
+from netflix_recommender.fields import FIELD_BLOCKS, FieldModel, load_field_model, save_field_model
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    FIT_WORKERS,
+    MATRIX_BUDGET_MB,
+    MetadataIndex,
+    UPLOAD_TYPES,
+    _EMPTY_TOKENS,
+    _display_titles,
+    _file_format,
+    _normalize_text,
+    _safe_str,
+    apply_catalog_delta,
+    build_facets,
+    build_inverted_index,
+    compact_frame,
+    dataset_fingerprint,
+    model_footprint,
+    read_catalog,
+    recommend_by_index,
+    recommend_by_profile,
+    recommend_by_query,
+    save_artifacts,
+)
 
 warnings.filterwarnings("ignore")
 
 # =========================================================
 # CONFIG
 # =========================================================
+SCRIPT_START = time.perf_counter()
+
 st.set_page_config(
     page_title="🎬 Netflix Recommender",
     page_icon="🎬",
@@ -23,8 +59,6 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-DEFAULT_DATA_PATH = Path(__file__).parent / "netflix_titles.csv"
-
 # =========================================================
 # CSS (FIXED + RAPIH + SIDEBAR SCROLL + SELECTBOX JELAS)
 # =========================================================
@@ -327,6 +361,24 @@ div[data-baseweb="popover"] div[role="option"][aria-selected="true"]{
 """
 st.markdown(NETFLIX_CSS, unsafe_allow_html=True)
 
+# Mode pencarian: scan eksak seluruh katalog, atau kandidat dari indeks ANN
+# (skor kandidat tetap eksak; n_probe dikalibrasi per indeks, lihat reports/ann_recall.md).
+# Hanya untuk rekomendasi judul & profil; kata kunci selalu lewat postings eksak.
+SEARCH_BACKENDS = ["Eksak (scan penuh)", "ANN (SVD + IVF)"]
+# Ruang skor: TF-IDF sparse, kandidat dari embedding SVD dense lalu skor TF-IDF
+# (aproksimasi, recall terukur per katalog), atau blok TF-IDF per field yang
+# bobotnya diatur dari sidebar tanpa refit.
+MODEL_MODES = ["TF-IDF (sparse)", "Kandidat SVD dense (aproksimasi)", "TF-IDF per field (berbobot)"]
+FIELD_LABELS = {
+    "title": "Judul",
+    "director": "Sutradara",
+    "cast": "Pemeran",
+    "country": "Negara",
+    "genre": "Genre",
+    "type_rating": "Tipe & rating",
+    "description": "Deskripsi",
+}
+
 # =========================================================
 # UI HELPERS
 # =========================================================
@@ -361,228 +413,108 @@ def ui_alert(kind: str, html: str) -> None:
     )
 
 # =========================================================
-# TEXT HELPERS
+# ENGINE (DIBUNGKUS CACHE STREAMLIT)
 # =========================================================
-def _normalize_text(x: object) -> str:
-    if x is None:
-        return ""
-    if isinstance(x, float) and np.isnan(x):
-        return ""
-    s = str(x).strip()
-    if s.lower() in {"unknown", "nan", "none", "null", ""}:
-        return ""
-    s = s.replace("&", " and ")
-    s = s.lower()
-    s = re.sub(r"[^0-9a-z]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def _safe_str(x: object) -> str:
-    if x is None:
-        return ""
-    if isinstance(x, float) and np.isnan(x):
-        return ""
-    s = str(x)
-    if s.strip().lower() in {"unknown", "nan", "none", "null", ""}:
-        return ""
-    return s
+def timed_stage(stage: str, **labels):
+    # Dipasang di bawah decorator cache: durasi tercatat hanya saat fungsi benar-benar
+    # jalan (cache miss), bukan untuk setiap cache hit ~0 ms di rerun berikutnya.
+    def wrap(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with REGISTRY.timed(stage, **labels):
+                return fn(*args, **kwargs)
+        return run
+    return wrap
 
-# =========================================================
-# DATA LOADING
-# =========================================================
 @st.cache_data(show_spinner=False)
+@timed_stage("load_data", source="local")
 def load_data_from_path(path_str: str) -> pd.DataFrame:
     try:
-        return pd.read_csv(path_str)
+        return read_catalog(path_str, _file_format(path_str))
     except Exception:
         return pd.DataFrame()
 
 @st.cache_data(show_spinner=False)
-def load_data_from_upload(file_bytes: bytes) -> pd.DataFrame:
+@timed_stage("load_data", source="upload")
+def load_data_from_upload(fingerprint: str, _file, file_name: str) -> pd.DataFrame:
+    # `fingerprint` jadi kunci cache; file dibaca langsung tanpa salinan bytes tambahan.
     try:
-        return pd.read_csv(io.BytesIO(file_bytes))
+        _file.seek(0)
+        return read_catalog(_file, _file_format(file_name))
     except Exception:
         return pd.DataFrame()
 
-@st.cache_data(show_spinner=False)
-def prepare_data(raw: pd.DataFrame) -> pd.DataFrame:
-    if raw is None or raw.empty:
-        return pd.DataFrame()
+prepare_data = st.cache_data(show_spinner=False)(timed_stage("prepare_data")(core.prepare_data))
+build_vectorizer_and_matrix = st.cache_resource(show_spinner=False)(
+    timed_stage("build_vectorizer_and_matrix")(core.build_vectorizer_and_matrix)
+)
+load_artifacts = st.cache_resource(show_spinner=False)(timed_stage("load_artifacts")(core.load_artifacts))
 
-    df = raw.copy()
-    df.columns = df.columns.str.strip().str.lower()
-
-    mapping = {
-        "show id": "show_id",
-        "show_id": "show_id",
-        "type": "type",
-        "title": "title",
-        "director": "director",
-        "cast": "cast",
-        "country": "country",
-        "date_added": "date_added",
-        "release year": "release_year",
-        "release_year": "release_year",
-        "rating": "rating",
-        "duration": "duration",
-        "listed in": "listed_in",
-        "listed_in": "listed_in",
-        "description": "description",
-    }
+@st.cache_resource(show_spinner=False)
+@timed_stage("build_index", index="dense")
+def get_dense_model(model_version: str, persist: bool, _tfidf_matrix):
+    # Proyeksi SVD dimuat dari artefak bila ada; model hasil delta hanya disimpan di memori.
+    model = load_dense_model(model_version) if persist else None
+    if model is None:
+        model = DenseModel.fit(_tfidf_matrix)
+        if persist:
+            save_dense_model(model_version, model)
+    return model
 
-    for old_name, new_name in mapping.items():
-        if old_name in df.columns and new_name not in df.columns:
-            df[new_name] = df[old_name]
-
-    expected = ["show_id","type","title","director","cast","country","release_year","rating","duration","listed_in","description"]
-    for col in expected:
-        if col not in df.columns:
-            df[col] = ""
-
-    df["type"] = df["type"].astype(str).str.strip()
-    df["type"] = df["type"].apply(lambda x: "TV Show" if str(x).lower() == "tv show" else x)
-    df["type"] = df["type"].apply(lambda x: "Movie" if str(x).lower() == "movie" else x)
-
-    text_cols = ["type","title","director","cast","country","rating","duration","listed_in","description"]
-    for c in text_cols:
-        df[c] = df[c].fillna("").astype(str)
-        df[c] = df[c].replace({"unknown": "", "Unknown": "", "nan": "", "NaN": "", "None": "", "none": ""})
-
-    df["release_year"] = pd.to_numeric(df["release_year"], errors="coerce").fillna(0).astype(int)
-
-    df["soup"] = (
-        df["title"].map(_normalize_text)
-        + " " + df["type"].map(_normalize_text)
-        + " " + df["director"].map(_normalize_text)
-        + " " + df["cast"].map(_normalize_text)
-        + " " + df["country"].map(_normalize_text)
-        + " " + df["listed_in"].map(_normalize_text)
-        + " " + df["rating"].map(_normalize_text)
-        + " " + df["description"].map(_normalize_text)
-    ).str.strip()
-
-    df["display_title"] = df["title"].astype(str) + " (" + df["type"].astype(str) + ", " + df["release_year"].astype(str) + ")"
-
-    dup = df["display_title"].duplicated(keep=False)
-    if dup.any():
-        df.loc[dup, "display_title"] = df.loc[dup].apply(
-            lambda r: f"{r['title']} ({r['type']}, {r['release_year']}) — {r.get('show_id','')}",
-            axis=1,
-        )
+@st.cache_resource(show_spinner=False)
+@timed_stage("build_index", index="fields")
+def get_field_model(model_version: str, persist: bool, _df, _vectorizer):
+    # Blok per field dibangun sekali per versi model; bobot hanya dipakai saat scoring.
+    model = load_field_model(model_version) if persist else None
+    if model is None:
+        model = FieldModel.build(_df, _vectorizer)
+        if persist:
+            save_field_model(model_version, model)
+    model.postings  # Postings CSC dibangun di sini (sekali per versi), bukan di request pertama.
+    return model
 
-    if df["show_id"].astype(str).duplicated().any():
-        df["show_id"] = df.apply(lambda r: f"{r.get('show_id','')}_{r.name}", axis=1)
+@st.cache_resource(show_spinner=False)
+@timed_stage("build_index", index="inverted")
+def get_inverted_index(model_version: str, _tfidf_matrix):
+    return build_inverted_index(_tfidf_matrix)
 
-    return df
+@st.cache_resource(show_spinner=False)
+def get_metadata_index(model_version: str, _df):
+    # Bitmap tipe/rating + permutasi tahun; dibangun ulang hanya saat versi dataset berubah.
+    return MetadataIndex.build(_df)
 
-# =========================================================
-# MODEL (TF-IDF)
-# =========================================================
 @st.cache_resource(show_spinner=False)
-def build_vectorizer_and_matrix(corpus: pd.Series):
-    if corpus is None or len(corpus) == 0:
-        return None, None
-    if corpus.astype(str).str.strip().eq("").all():
-        return None, None
-
-    vectorizer = TfidfVectorizer(
-        stop_words="english",
-        ngram_range=(1, 2),
-        min_df=1,
-        max_df=0.95,
-        sublinear_tf=True,
-    )
-    tfidf_matrix = vectorizer.fit_transform(corpus.astype(str).values)
-    return vectorizer, tfidf_matrix
-
-def recommend_by_index(
-    idx: int,
-    df: pd.DataFrame,
-    tfidf_matrix,
-    top_n: int = 10,
-    same_type: bool = True,
-    year_min: Optional[int] = None,
-    year_max: Optional[int] = None,
-) -> pd.DataFrame:
-    if df is None or df.empty:
-        return pd.DataFrame()
-    if idx < 0 or idx >= len(df):
-        return pd.DataFrame()
+@timed_stage("build_facets")
+def get_facets(model_version: str, _df):
+    # Statistik & tabel hitungan dashboard: sekali per versi dataset.
+    return build_facets(_df)
 
-    sims = linear_kernel(tfidf_matrix[idx], tfidf_matrix).flatten()
-    order = sims.argsort()[::-1]
-    order = order[order != idx]
-
-    recs = df.iloc[order].copy()
-    recs["similarity"] = sims[order]
-
-    if same_type:
-        selected_type = df.iloc[idx].get("type", "")
-        if selected_type:
-            recs = recs[recs["type"] == selected_type]
-
-    if year_min is not None:
-        recs = recs[recs["release_year"] >= year_min]
-    if year_max is not None:
-        recs = recs[recs["release_year"] <= year_max]
-
-    return recs.head(top_n)
-
-def recommend_by_query(
-    query: str,
-    df: pd.DataFrame,
-    vectorizer: TfidfVectorizer,
-    tfidf_matrix,
-    top_n: int = 10,
-    type_filter: str = "All",
-    year_min: Optional[int] = None,
-    year_max: Optional[int] = None,
-) -> pd.DataFrame:
-    q = _normalize_text(query)
-    if not q:
-        return pd.DataFrame()
+@st.cache_resource(show_spinner=False)
+def get_display_titles(model_version: str, _df):
+    # "Judul (Tipe, Tahun)" tidak disimpan di frame; dibentuk sekali per versi model.
+    return _display_titles(_df).to_numpy(dtype=object)
 
-    q_vec = vectorizer.transform([q])
-    if q_vec.nnz == 0:
-        return pd.DataFrame()
+@st.cache_resource(show_spinner=False)
+def get_title_index(model_version: str, _titles):
+    return TitleIndex.build(_titles)
 
-    sims = linear_kernel(q_vec, tfidf_matrix).flatten()
-    order = sims.argsort()[::-1]
-
-    recs = df.iloc[order].copy()
-    recs["similarity"] = sims[order]
-
-    if type_filter != "All":
-        recs = recs[recs["type"] == type_filter]
-
-    if year_min is not None:
-        recs = recs[recs["release_year"] >= year_min]
-    if year_max is not None:
-        recs = recs[recs["release_year"] <= year_max]
-
-    return recs.head(top_n)
-
-def split_and_count(series: pd.Series, sep: str = ",", top_k: int = 10) -> pd.Series:
-    s = series.fillna("").astype(str).replace({"unknown": "", "Unknown": "", "nan": "", "NaN": ""})
-    exploded = s.str.split(sep).explode().astype(str).str.strip()
-    exploded = exploded[exploded != ""]
-    return exploded.value_counts().head(top_k)
-
-def create_dashboard_stats(df: pd.DataFrame) -> dict:
-    stats = {}
-    stats["total"] = len(df)
-    stats["movies"] = int((df["type"] == "Movie").sum())
-    stats["tv_shows"] = int((df["type"] == "TV Show").sum())
-    valid_years = df["release_year"][df["release_year"] > 0]
-    if len(valid_years) > 0:
-        stats["min_year"] = int(valid_years.min())
-        stats["max_year"] = int(valid_years.max())
-        stats["avg_year"] = int(valid_years.mean())
-    else:
-        stats["min_year"] = 1900
-        stats["max_year"] = datetime.now().year
-        stats["avg_year"] = 2000
-    return stats
+@st.cache_resource(show_spinner=False)
+@timed_stage("build_index", index="ann")
+def build_ann_index(model_version: str, _tfidf_matrix):
+    # Indeks ANN hanya dibangun bila mode ANN dipilih; kunci cache = versi model.
+    # n_probe dikalibrasi saat build; `usable` False = target recall tidak tercapai.
+    return IVFIndex.build(_tfidf_matrix)
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache():
+    # Satu cache hasil per proses, dipakai bersama semua sesi.
+    return ResultCache()
+
+@st.cache_resource(show_spinner=False)
+@timed_stage("apply_catalog_delta")
+def update_catalog(base_fingerprint: str, delta_fingerprint: str, _df, _vectorizer, _tfidf_matrix, _neighbors, _delta_raw):
+    # Kunci cache = pasangan sidik jari dataset dasar & delta.
+    return apply_catalog_delta(_df, _vectorizer, _tfidf_matrix, _neighbors, _delta_raw)
 
 # =========================================================
 # UI CARDS
@@ -600,66 +532,117 @@ def display_metric_card(title: str, value: str, subtitle: str = "", icon: str =
         unsafe_allow_html=True,
     )
 
-def display_recommendation_card(r: pd.Series, rank: int) -> None:
-    similarity = float(r.get("similarity", 0.0))
-    title = _safe_str(r.get("title", ""))
-    content_type = _safe_str(r.get("type", ""))
-    year = r.get("release_year", "")
-    rating = _safe_str(r.get("rating", ""))
-    genre = _safe_str(r.get("listed_in", ""))
-    description = _safe_str(r.get("description", "Tidak ada deskripsi"))
-    director = _safe_str(r.get("director", ""))
-    country = _safe_str(r.get("country", ""))
-    duration = _safe_str(r.get("duration", ""))
+# Kartu hasil sebagai template; diisi per kolom (vektor) untuk satu halaman hasil,
+# lalu dikirim sebagai satu elemen markdown (bukan satu elemen per kartu).
+RESULTS_PAGE_SIZE = 5
+POPULAR_SAMPLE_SIZE = 8
+CARD_TEMPLATE = " ".join(line.strip() for line in """
+<div class="glass-panel" style="padding:1.2rem;">
+  <div style="display:flex; justify-content:space-between; align-items:flex-start; gap:0.8rem; flex-wrap:wrap;">
+    <div style="display:flex; gap:0.8rem; align-items:center; flex-wrap:wrap;">
+      <div style="background:linear-gradient(135deg,var(--red),var(--red2)); padding:0.45rem 0.85rem;
+                  border-radius:10px; font-weight:900; border:1px solid #FFF;">#{rank}</div>
+      <div style="font-size:1.25rem; font-weight:900; color:#FFFFFF; word-break:break-word;">{title}</div>
+    </div>
+    <div style="background:linear-gradient(135deg,var(--red),var(--red2)); padding:0.45rem 0.85rem;
+                border-radius:18px; font-weight:900; border:1px solid #FFF; white-space:nowrap;">{similarity}</div>
+  </div>
+  <div style="margin-top:0.9rem;">
+    <span class="badge">🎬 {type}</span>
+    <span class="badge badge-year">📅 {release_year}</span>
+    <span class="badge badge-rating">⭐ {rating}</span>
+    <span class="badge">⏱️ {duration}</span>
+  </div>
+  <div style="margin-top:0.8rem; color:var(--text); line-height:1.5;">
+    <b style="color:var(--red);">🎭 Genre:</b> {listed_in}
+  </div>
+  <div style="margin-top:0.6rem; color:var(--text); line-height:1.5;">{description}</div>
+  <div style="margin-top:0.9rem; display:flex; gap:0.8rem; flex-wrap:wrap;">
+    <div class="stats-card" style="flex:1; min-width:220px; padding:0.9rem;">
+      <div style="color:var(--red); font-weight:900;">🎬 Sutradara</div>
+      <div style="margin-top:0.45rem; font-weight:800; color:#FFF;">{director}</div>
+    </div>
+    <div class="stats-card" style="flex:1; min-width:220px; padding:0.9rem;">
+      <div style="color:var(--red); font-weight:900;">🌍 Negara</div>
+      <div style="margin-top:0.45rem; font-weight:800; color:#FFF;">{country}</div>
+    </div>
+  </div>
+</div>
+""".split("\n") if line.strip())
+# Kolom teks kartu -> pengganti bila kosong/"unknown" (sama dengan `_safe_str(...) or "N/A"`).
+CARD_TEXT_COLUMNS = {
+    "title": "", "type": "", "rating": "N/A", "duration": "N/A", "listed_in": "N/A",
+    "description": "", "director": "N/A", "country": "N/A",
+}
 
-    st.markdown(
-        f"""
-        <div class="glass-panel" style="padding:1.2rem;">
-          <div style="display:flex; justify-content:space-between; align-items:flex-start; gap:0.8rem; flex-wrap:wrap;">
-            <div style="display:flex; gap:0.8rem; align-items:center; flex-wrap:wrap;">
-              <div style="background:linear-gradient(135deg,var(--red),var(--red2)); padding:0.45rem 0.85rem;
-                          border-radius:10px; font-weight:900; border:1px solid #FFF;">
-                #{rank}
-              </div>
-              <div style="font-size:1.25rem; font-weight:900; color:#FFFFFF; word-break:break-word;">
-                {title}
-              </div>
-            </div>
-            <div style="background:linear-gradient(135deg,var(--red),var(--red2)); padding:0.45rem 0.85rem;
-                        border-radius:18px; font-weight:900; border:1px solid #FFF; white-space:nowrap;">
-              {similarity:.1%}
-            </div>
-          </div>
+def _card_text(recs: pd.DataFrame, column: str, default: str) -> pd.Series:
+    if column not in recs.columns:
+        return pd.Series(default, index=recs.index)
+    s = recs[column].astype(object).where(recs[column].notna(), "").astype(str)
+    s = s.where(~s.str.strip().str.lower().isin(_EMPTY_TOKENS), default)
+    return s.map(html.escape)
 
-          <div style="margin-top:0.9rem;">
-            <span class="badge">🎬 {content_type}</span>
-            <span class="badge badge-year">📅 {year}</span>
-            <span class="badge badge-rating">⭐ {rating or "N/A"}</span>
-            <span class="badge">⏱️ {duration or "N/A"}</span>
-          </div>
+def recommendation_cards_html(recs: pd.DataFrame, start_rank: int = 1) -> str:
+    """HTML kartu untuk semua baris `recs` (peringkat mulai `start_rank`), tiap kolom diisi sekaligus."""
+    if recs.empty:
+        return ""
+    values = {column: _card_text(recs, column, default) for column, default in CARD_TEXT_COLUMNS.items()}
+    values["rank"] = pd.Series(range(start_rank, start_rank + len(recs)), index=recs.index).astype(str)
+    values["release_year"] = _card_text(recs, "release_year", "")
+    similarity = recs["similarity"] if "similarity" in recs.columns else pd.Series(0.0, index=recs.index)
+    values["similarity"] = (similarity.astype(float) * 100).round(1).astype(str) + "%"
+
+    cards = pd.Series("", index=recs.index)
+    for literal, field, _, _ in string.Formatter().parse(CARD_TEMPLATE):
+        cards = cards + literal
+        if field is not None:
+            cards = cards + values[field]
+    return "".join(cards)
+
+def _shift_page(key: str, step: int, n_pages: int) -> None:
+    page = st.session_state.get(f"page_{key}", 0) + step
+    st.session_state[f"page_{key}"] = min(max(page, 0), n_pages - 1)
+
+def render_result_page(key: str, recs: pd.DataFrame, page_size: int = RESULTS_PAGE_SIZE,
+                       columns: int = 1) -> None:
+    """Satu halaman `recs` sebagai satu elemen HTML, plus navigasi halaman bila lebih dari satu."""
+    n_pages = max(1, -(-len(recs) // page_size))
+    page = min(st.session_state.get(f"page_{key}", 0), n_pages - 1)
+    start = page * page_size
+    cards = recommendation_cards_html(recs.iloc[start:start + page_size], start + 1)
+    if columns > 1:
+        cards = (f'<div style="display:grid; grid-template-columns:repeat({columns}, minmax(0, 1fr)); '
+                 f'gap:0 1rem;">{cards}</div>')
+    st.markdown(cards, unsafe_allow_html=True)
+
+    if n_pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            st.button("◀ Sebelumnya", key=f"prev_{key}", disabled=page == 0,
+                      on_click=_shift_page, args=(key, -1, n_pages), use_container_width=True)
+        with info_col:
+            st.markdown(
+                f'<div style="text-align:center; padding-top:0.4rem; color:var(--muted); font-weight:750;">'
+                f"Halaman {page + 1} / {n_pages} · hasil {start + 1}–{min(start + page_size, len(recs))} "
+                f"dari {len(recs)}</div>",
+                unsafe_allow_html=True,
+            )
+        with next_col:
+            st.button("Berikutnya ▶", key=f"next_{key}", disabled=page >= n_pages - 1,
+                      on_click=_shift_page, args=(key, 1, n_pages), use_container_width=True)
 
-          <div style="margin-top:0.8rem; color:var(--text); line-height:1.5;">
-            <b style="color:var(--red);">🎭 Genre:</b> {genre or "N/A"}
-          </div>
+# Hasil terakhir per tab disimpan di session state (terikat versi model), sehingga
+# rerun karena ganti halaman / widget lain tidak menghitung ulang similarity.
+def remember_results(key: str, version: str, recs: pd.DataFrame, **info) -> None:
+    st.session_state[f"results_{key}"] = {"version": version, "recs": recs, **info}
+    st.session_state[f"page_{key}"] = 0
 
-          <div style="margin-top:0.6rem; color:var(--text); line-height:1.5;">
-            {description}
-          </div>
+def recall_results(key: str, version: str):
+    stored = st.session_state.get(f"results_{key}")
+    return stored if stored is not None and stored["version"] == version else None
 
-          <div style="margin-top:0.9rem; display:flex; gap:0.8rem; flex-wrap:wrap;">
-            <div class="stats-card" style="flex:1; min-width:220px; padding:0.9rem;">
-              <div style="color:var(--red); font-weight:900;">🎬 Sutradara</div>
-              <div style="margin-top:0.45rem; font-weight:800; color:#FFF;">{director or "N/A"}</div>
-            </div>
-            <div class="stats-card" style="flex:1; min-width:220px; padding:0.9rem;">
-              <div style="color:var(--red); font-weight:900;">🌍 Negara</div>
-              <div style="margin-top:0.45rem; font-weight:800; color:#FFF;">{country or "N/A"}</div>
-            </div>
-          </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+def forget_results(key: str) -> None:
+    st.session_state.pop(f"results_{key}", None)
 
 def display_selected_card(item: pd.Series) -> None:
     """Film/TV yang dipilih tampil seperti card (tanpa similarity)."""
@@ -768,31 +751,44 @@ with st.sidebar:
     )
 
     st.markdown('<div class="sidebar-title">📁 DATASET</div>', unsafe_allow_html=True)
-    uploaded = st.file_uploader("Unggah Dataset CSV", type=["csv"], key="uploader_csv")
+    uploaded = st.file_uploader("Unggah Dataset (CSV / Parquet / Feather)", type=UPLOAD_TYPES, key="uploader_csv")
     use_local = st.checkbox("Gunakan dataset lokal (netflix_titles.csv)", value=True, key="use_local")
+    delta_file = st.file_uploader(
+        "Delta katalog (show_id baru / berubah)", type=UPLOAD_TYPES, key="uploader_delta"
+    )
 
 # =========================================================
 # LOAD DATA (FIX NameError: uploaded sudah pasti ada)
 # =========================================================
 raw_df = None
+artifacts = None
+fingerprint = None
 data_loaded = False
 
 if uploaded is not None:
-    with st.spinner("Memuat dataset dari upload..."):
-        raw_df = load_data_from_upload(uploaded.getvalue())
-    if raw_df is not None and not raw_df.empty:
+    fingerprint = dataset_fingerprint(uploaded.getbuffer())
+    artifacts = load_artifacts(fingerprint)
+    if artifacts is None:
+        with st.spinner("Memuat dataset dari upload..."):
+            raw_df = load_data_from_upload(fingerprint, uploaded, uploaded.name)
+    n_loaded = len(artifacts[0]) if artifacts is not None else (0 if raw_df is None else len(raw_df))
+    if n_loaded > 0:
         data_loaded = True
-        ui_alert("success", f"<b>Dataset berhasil dimuat</b> — {len(raw_df):,} baris")
+        ui_alert("success", f"<b>Dataset berhasil dimuat</b> — {n_loaded:,} baris")
     else:
         ui_alert("error", "Dataset upload kosong / tidak valid.")
 
 elif use_local:
     if DEFAULT_DATA_PATH.exists():
-        with st.spinner("Memuat dataset lokal..."):
-            raw_df = load_data_from_path(str(DEFAULT_DATA_PATH))
-        if raw_df is not None and not raw_df.empty:
+        fingerprint = dataset_fingerprint(DEFAULT_DATA_PATH)
+        artifacts = load_artifacts(fingerprint)
+        if artifacts is None:
+            with st.spinner("Memuat dataset lokal..."):
+                raw_df = load_data_from_path(str(DEFAULT_DATA_PATH))
+        n_loaded = len(artifacts[0]) if artifacts is not None else (0 if raw_df is None else len(raw_df))
+        if n_loaded > 0:
             data_loaded = True
-            ui_alert("success", f"<b>Dataset lokal berhasil dimuat</b> — {len(raw_df):,} baris")
+            ui_alert("success", f"<b>Dataset lokal berhasil dimuat</b> — {n_loaded:,} baris")
         else:
             ui_alert("error", "Dataset lokal kosong / gagal dibaca.")
     else:
@@ -803,7 +799,7 @@ if not data_loaded:
         "info",
         """
         <b>Cara pakai:</b><br>
-        1) Upload CSV Netflix, atau<br>
+        1) Upload dataset Netflix (CSV / Parquet / Feather), atau<br>
         2) Letakkan <code>netflix_titles.csv</code> di folder yang sama dengan <code>app.py</code>.
         """,
     )
@@ -812,17 +808,50 @@ if not data_loaded:
 # =========================================================
 # PROCESS + BUILD MODEL
 # =========================================================
-with st.spinner("Memproses data & membangun model TF-IDF..."):
-    df = prepare_data(raw_df)
-    vectorizer, tfidf_matrix = build_vectorizer_and_matrix(df["soup"])
+if artifacts is not None:
+    # Warm start: frame & model dimuat dari artefak di disk, tanpa refit.
+    df, vectorizer, tfidf_matrix, neighbors = artifacts
+else:
+    with st.spinner("Memproses data & membangun model TF-IDF..."):
+        df = prepare_data(raw_df)
+        vectorizer, tfidf_matrix = build_vectorizer_and_matrix(df["soup"], workers=FIT_WORKERS)
+        # Tabel tetangga O(N²) hanya dibangun offline (batch --neighbor-table); tanpanya skor live.
+        neighbors = None
 
 if df.empty or vectorizer is None or tfidf_matrix is None:
     ui_alert("error", "Model tidak bisa dibangun (data kosong atau teks kosong).")
     st.stop()
 
-stats = create_dashboard_stats(df)
-unique_types = sorted([t for t in df["type"].unique().tolist() if t and str(t) != "nan"])
+if artifacts is None:
+    if save_artifacts(fingerprint, df, vectorizer, tfidf_matrix, neighbors):
+        # Hasil "belum ada" yang tersimpan di cache harus dibuang agar rerun berikutnya warm start;
+        # frame hasil prepare_data (dengan `soup`) tidak dipakai lagi setelah itu.
+        load_artifacts.clear()
+        prepare_data.clear()
+    df = compact_frame(df)
+
+# Versi model = dataset (+ delta); jadi kunci cache turunan seperti indeks ANN.
+model_version = fingerprint
+
+if delta_file is not None:
+    delta_fingerprint = dataset_fingerprint(delta_file.getbuffer())
+    delta_raw = load_data_from_upload(delta_fingerprint, delta_file, delta_file.name)
+    if delta_raw.empty:
+        ui_alert("error", "Delta katalog kosong / tidak valid.")
+    else:
+        with st.spinner("Menerapkan delta katalog..."):
+            df, vectorizer, tfidf_matrix, neighbors, n_changed = update_catalog(
+                fingerprint, delta_fingerprint, df, vectorizer, tfidf_matrix, neighbors, delta_raw
+            )
+        ui_alert("success", f"<b>Delta katalog diterapkan</b> — {n_changed:,} judul baru / berubah")
+        model_version = f"{fingerprint}+{delta_fingerprint}"
+
+facets = get_facets(model_version, df)
+stats = facets["stats"]
+meta_index = get_metadata_index(model_version, df)
+unique_types = sorted([t for t in facets["type"].index.tolist() if t and str(t) != "nan"])
 type_options = ["All"] + unique_types
+rating_options = ["All"] + sorted(meta_index.rating_bitmaps)
 min_year = stats.get("min_year", 1900)
 max_year = stats.get("max_year", datetime.now().year)
 
@@ -860,11 +889,119 @@ with st.sidebar:
         unsafe_allow_html=True,
     )
 
+    st.markdown('<div class="sidebar-title">⚙️ MESIN PENCARIAN</div>', unsafe_allow_html=True)
+    search_backend = st.radio(
+        "Mesin pencarian",
+        SEARCH_BACKENDS,
+        index=0,
+        label_visibility="collapsed",
+        key="search_backend",
+    )
+    model_mode = st.radio(
+        "Model",
+        MODEL_MODES,
+        index=0,
+        label_visibility="collapsed",
+        key="model_mode",
+    )
+    field_weights = None
+    if model_mode == MODEL_MODES[2]:
+        st.caption("Bobot field (0 = abaikan)")
+        field_weights = {
+            name: st.slider(FIELD_LABELS[name], 0.0, 3.0, 1.0, 0.25, key=f"field_weight_{name}")
+            for name in FIELD_BLOCKS
+        }
+        if not any(w > 0 for w in field_weights.values()):
+            st.warning("Semua bobot 0 — memakai bobot sama rata.")
+            field_weights = None
+
+result_cache = get_result_cache()
+# Dataset sesi ini berganti (upload / delta): buang hasil cache versi sebelumnya.
+previous_version = st.session_state.get("model_version")
+if previous_version is not None and previous_version != model_version:
+    result_cache.invalidate(previous_version)
+st.session_state["model_version"] = model_version
+
+with st.sidebar:
+    cache_stats = result_cache.stats()
+    st.caption(
+        f"Cache hasil: {cache_stats['size']}/{cache_stats['maxsize']} entri · "
+        f"hit {cache_stats['hits']:,} · miss {cache_stats['misses']:,} · "
+        f"evict {cache_stats['evictions']:,}"
+    )
+    if neighbors is None:
+        st.caption("Tabel tetangga belum dibangun (`python -m netflix_recommender.batch --neighbor-table`); "
+                   "rekomendasi judul diskor live.")
+
+inverted_index = get_inverted_index(model_version, tfidf_matrix)
+
+ann_index = None
+ann_about = "Indeks ANN belum dibangun pada sesi ini (pilih backend ANN di sidebar)."
+if search_backend == SEARCH_BACKENDS[1]:
+    with st.spinner("Membangun indeks ANN (SVD + IVF)..."):
+        ann_index = build_ann_index(model_version, tfidf_matrix)
+    ann_text = (
+        f"recall@{ANN_RECALL_K} terukur {ann_index.recall:.2f} dengan n_probe {ann_index.n_probe} "
+        f"dari {ann_index.n_lists} daftar ({ann_index.candidate_ratio:.1%} katalog per query)"
+    )
+    ann_about = f"Indeks yang dimuat: {ann_text} — {'dipakai' if ann_index.usable else 'tidak dipakai'}."
+    if ann_index.usable:
+        st.sidebar.caption(f"ANN: {ann_text}. Kata kunci tetap memakai postings eksak.")
+    else:
+        st.sidebar.warning(
+            f"ANN tidak dipakai untuk katalog ini: {ann_text} (target {ANN_RECALL_TARGET:g}). "
+            "Rekomendasi memakai scan eksak."
+        )
+        ann_index = None
+
+dense_model = None
+if model_mode == MODEL_MODES[1]:
+    with st.spinner("Menyiapkan embedding dense (SVD)..."):
+        dense_model = get_dense_model(model_version, model_version == fingerprint, tfidf_matrix)
+    dense_fp = dense_model.footprint()
+    sparse_bytes = tfidf_matrix.data.nbytes + tfidf_matrix.indices.nbytes + tfidf_matrix.indptr.nbytes
+    recall_text = (
+        f"recall@{DENSE_RECALL_K} terukur {dense_fp['recall']:.2f} dengan {dense_fp['n_candidates']:,} kandidat"
+    )
+    if dense_model.usable:
+        st.sidebar.caption(
+            f"Dense: {recall_text} (skor akhir TF-IDF). Proyeksi {dense_fp['projection_bytes'] / 2**20:.1f} MB "
+            f"({dense_fp['features']:,} fitur x {dense_fp['dim']}) + embedding "
+            f"{dense_fp['embedding_bytes'] / 2**20:.1f} MB; TF-IDF sparse: {sparse_bytes / 2**20:.1f} MB."
+        )
+    else:
+        st.sidebar.warning(
+            f"Mode dense tidak dipakai untuk katalog ini: {recall_text} "
+            f"(target {DENSE_RECALL_TARGET:g}). Rekomendasi memakai TF-IDF (sparse)."
+        )
+        dense_model = None
+
+field_scorer = None
+if model_mode == MODEL_MODES[2]:
+    with st.spinner("Menyiapkan blok TF-IDF per field..."):
+        field_model = get_field_model(model_version, model_version == fingerprint, df, vectorizer)
+    field_scorer = field_model.weighted(field_weights)
+
+# Kunci ruang skor untuk cache hasil: mode model yang benar-benar aktif + bobot field (bila dipakai).
+active_mode = MODEL_MODES[0] if model_mode == MODEL_MODES[1] and dense_model is None else model_mode
+score_space = (active_mode, tuple(field_scorer.block_weights.round(6)) if field_scorer is not None else None)
+
+# Label mode rekomendasi untuk metrik: backend kandidat / ruang skor.
+space_label = "dense" if dense_model is not None else "fields" if field_scorer is not None else "tfidf"
+rec_mode = f"{'ann' if ann_index is not None else 'exact'}/{space_label}"
+
+def timed_call(stage: str, fn):
+    # Hanya hitungan sebenarnya (cache miss) yang masuk histogram tahap rekomendasi.
+    def run():
+        with REGISTRY.timed(stage, mode=rec_mode):
+            return fn()
+    return run
+
 # =========================================================
 # PAGE: REKOMENDASI
 # =========================================================
 if page == "🎯 REKOMENDASI":
-    tabs = st.tabs(["🎬 Berdasarkan Judul", "🔍 Berdasarkan Kata Kunci", "⭐ Konten Populer"])
+    tabs = st.tabs(["🎬 Berdasarkan Judul", "🧩 Profil (Beberapa Judul)", "🔍 Berdasarkan Kata Kunci", "⭐ Konten Populer"])
 
     # -------------------------
     # TAB 1: TITLE-BASED
@@ -893,21 +1030,24 @@ if page == "🎯 REKOMENDASI":
                 key="type_filter_titles",
             )
 
-            selector_df = df if type_filter_for_titles == "All" else df[df["type"] == type_filter_for_titles]
-            if title_search.strip():
-                mask = selector_df["display_title"].str.contains(title_search, case=False, na=False)
-                selector_df = selector_df[mask] if mask.any() else selector_df
-
-            options = selector_df["display_title"].tolist()
-            if not options:
+            # Opsi = posisi baris (maks. TITLE_OPTIONS_LIMIT, terurut relevansi), bukan seluruh katalog.
+            title_index = get_title_index(model_version, df["title"])
+            title_type = type_filter_for_titles if type_filter_for_titles != "All" else None
+            allowed = meta_index.mask(meta_index.select(title_type))
+            options = title_index.search(title_search, TITLE_OPTIONS_LIMIT, allowed)
+            if title_search.strip() and len(options) == 0:
+                options = title_index.search("", TITLE_OPTIONS_LIMIT, allowed)
+            if len(options) == 0:
                 ui_alert("warning", "Tidak ada konten untuk filter ini.")
                 st.markdown("</div>", unsafe_allow_html=True)
                 st.stop()
 
-            selected_display = st.selectbox(
+            display_titles = get_display_titles(model_version, df)
+            selected_row = st.selectbox(
                 "Judul",
-                options=options,
+                options=options.tolist(),
                 index=0,
+                format_func=lambda i: display_titles[i],
                 key="title_selector",
             )
 
@@ -935,36 +1075,53 @@ if page == "🎯 REKOMENDASI":
             st.markdown("</div>", unsafe_allow_html=True)
 
             if st.button("🚀 Dapatkan Rekomendasi", type="primary", key="get_recs_btn"):
-                matches = df[df["display_title"] == selected_display]
-                if matches.empty:
+                if selected_row is None or not 0 <= selected_row < len(df):
+                    forget_results("title")
                     ui_alert("error", "Judul tidak ditemukan.")
                 else:
-                    idx = matches.index[0]
-                    selected_item = df.loc[idx]
-
-                    st.markdown("---")
-                    st.markdown("## ✅ Konten yang Dipilih")
-                    # ✅ tampil seperti card rekomendasi
-                    display_selected_card(selected_item)
+                    idx = int(selected_row)
+                    selected_item = df.iloc[idx]
 
+                    cache_key = (
+                        model_version, "title", str(selected_item["show_id"]), same_type,
+                        year_min, year_max, top_n, search_backend, score_space,
+                    )
                     with st.spinner("Mencari rekomendasi terbaik..."):
-                        recs = recommend_by_index(
-                            idx=idx,
-                            df=df,
-                            tfidf_matrix=tfidf_matrix,
-                            top_n=top_n,
-                            same_type=same_type,
-                            year_min=year_min,
-                            year_max=year_max,
-                        )
-
-                    st.markdown("---")
-                    if recs.empty:
-                        ui_alert("warning", "Tidak menemukan rekomendasi. Coba longgarkan filter.")
-                    else:
-                        ui_alert("success", f"Menampilkan <b>{len(recs)}</b> rekomendasi teratas.")
-                        for i, (_, r) in enumerate(recs.iterrows(), 1):
-                            display_recommendation_card(r, i)
+                        recs = result_cache.get_or_compute(
+                            cache_key,
+                            timed_call("recommend_by_index", lambda: recommend_by_index(
+                                idx=idx,
+                                df=df,
+                                tfidf_matrix=tfidf_matrix,
+                                top_n=top_n,
+                                same_type=same_type,
+                                year_min=year_min,
+                                year_max=year_max,
+                                neighbors=neighbors,
+                                ann_index=ann_index,
+                                dense_model=dense_model,
+                                inverted_index=inverted_index,
+                                meta_index=meta_index,
+                                field_scorer=field_scorer,
+                            )),
+                        ).copy()
+                    remember_results("title", model_version, recs, selected=idx)
+
+            shown = recall_results("title", model_version)
+            if shown is not None:
+                st.markdown("---")
+                st.markdown("## ✅ Konten yang Dipilih")
+                # ✅ tampil seperti card rekomendasi
+                display_selected_card(df.iloc[shown["selected"]])
+
+                st.markdown("---")
+                recs = shown["recs"]
+                if recs.empty:
+                    ui_alert("warning", "Tidak menemukan rekomendasi. Coba longgarkan filter.")
+                else:
+                    ui_alert("success", f"Menampilkan <b>{len(recs)}</b> rekomendasi teratas.")
+                    with REGISTRY.timed("render_cards", tab="title"):
+                        render_result_page("title", recs)
 
         with col2:
             st.markdown("## 📊 Statistik Dataset")
@@ -974,14 +1131,108 @@ if page == "🎯 REKOMENDASI":
             display_metric_card("Tahun Terbaru", str(stats["max_year"]), "Konten terupdate", "🚀")
 
             st.markdown("## 🎭 Genre Populer")
-            top_genres = split_and_count(df["listed_in"], sep=",", top_k=8)
+            top_genres = facets["listed_in"].head(8)
             if len(top_genres) > 0:
                 st.bar_chart(top_genres)
 
     # -------------------------
-    # TAB 2: QUERY-BASED
+    # TAB 2: PROFILE (MULTI-SEED)
     # -------------------------
     with tabs[1]:
+        st.markdown("## 🧩 Rekomendasi dari Beberapa Judul")
+        st.markdown('<div class="glass-panel">', unsafe_allow_html=True)
+
+        profile_search = st.text_input(
+            "Cari judul untuk profil",
+            placeholder="Ketik sebagian judul, lalu tambahkan ke daftar suka / tidak suka...",
+            key="profile_search",
+        )
+        # Opsi = hasil pencarian judul + judul yang sudah dipilih (agar pilihan tidak hilang saat mencari).
+        profile_title_index = get_title_index(model_version, df["title"])
+        found = profile_title_index.search(profile_search, TITLE_OPTIONS_LIMIT).tolist()
+        profile_titles = get_display_titles(model_version, df)
+
+        def profile_options(key: str) -> list:
+            chosen = [i for i in st.session_state.get(key, []) if 0 <= i < len(df)]
+            return chosen + [i for i in found if i not in chosen]
+
+        liked_rows = st.multiselect(
+            "👍 Judul yang disukai",
+            options=profile_options("profile_liked"),
+            format_func=lambda i: profile_titles[i],
+            key="profile_liked",
+        )
+        disliked_rows = st.multiselect(
+            "👎 Judul yang tidak disukai (opsional)",
+            options=profile_options("profile_disliked"),
+            format_func=lambda i: profile_titles[i],
+            key="profile_disliked",
+        )
+
+        p1, p2, p3 = st.columns([1.2, 1.2, 1.0])
+        with p1:
+            top_n_p = st.slider("Jumlah rekomendasi", 5, 20, 10, 1, key="top_n_profile")
+        with p2:
+            year_range_p = st.slider(
+                "Rentang tahun",
+                min_value=min_year,
+                max_value=max_year,
+                value=(min_year, max_year),
+                key="year_range_profile",
+            )
+        with p3:
+            same_type_p = st.checkbox("Tipe sama", value=True, key="same_type_profile",
+                                      help="Berlaku bila semua judul yang disukai bertipe sama.")
+        year_min_p, year_max_p = year_range_p
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        if st.button("🚀 Rekomendasi dari Profil", type="primary", key="get_profile_recs_btn"):
+            if not liked_rows:
+                forget_results("profile")
+                ui_alert("warning", "Pilih minimal satu judul yang disukai.")
+            else:
+                show_ids = df["show_id"].astype(str).to_numpy()
+                cache_key = (
+                    model_version, "profile",
+                    tuple(sorted(show_ids[liked_rows])), tuple(sorted(show_ids[disliked_rows])),
+                    same_type_p, year_min_p, year_max_p, top_n_p, search_backend, score_space,
+                )
+                with st.spinner("Menghitung profil & mencari rekomendasi..."):
+                    recs_p = result_cache.get_or_compute(
+                        cache_key,
+                        timed_call("recommend_by_profile", lambda: recommend_by_profile(
+                            seeds=liked_rows,
+                            df=df,
+                            tfidf_matrix=tfidf_matrix,
+                            top_n=top_n_p,
+                            negative_seeds=disliked_rows,
+                            same_type=same_type_p,
+                            year_min=year_min_p,
+                            year_max=year_max_p,
+                            ann_index=ann_index,
+                            dense_model=dense_model,
+                            inverted_index=inverted_index,
+                            meta_index=meta_index,
+                            field_scorer=field_scorer,
+                        )),
+                    ).copy()
+                remember_results("profile", model_version, recs_p, n_liked=len(liked_rows))
+
+        shown = recall_results("profile", model_version)
+        if shown is not None:
+            st.markdown("---")
+            recs_p = shown["recs"]
+            if recs_p.empty:
+                ui_alert("warning", "Tidak menemukan rekomendasi. Coba longgarkan filter.")
+            else:
+                ui_alert("success", f"Menampilkan <b>{len(recs_p)}</b> rekomendasi dari <b>{shown['n_liked']}</b> judul.")
+                with REGISTRY.timed("render_cards", tab="profile"):
+                    render_result_page("profile", recs_p)
+
+    # -------------------------
+    # TAB 3: QUERY-BASED
+    # -------------------------
+    with tabs[2]:
         st.markdown("## 🔍 Pencarian Berdasarkan Kata Kunci")
 
         qcol1, qcol2 = st.columns([3, 1])
@@ -995,12 +1246,14 @@ if page == "🎯 REKOMENDASI":
         with qcol2:
             search_btn = st.button("🔍 Cari", type="primary", key="search_btn")
 
-        f1, f2, f3 = st.columns(3)
+        f1, f2, f3, f4 = st.columns([1, 1, 1, 1.4])
         with f1:
             type_filter = st.selectbox("Filter tipe", options=type_options, index=0, key="type_filter_search")
         with f2:
-            top_n_q = st.slider("Jumlah hasil", 5, 20, 10, key="top_n_search")
+            rating_filter = st.selectbox("Filter rating", options=rating_options, index=0, key="rating_filter_search")
         with f3:
+            top_n_q = st.slider("Jumlah hasil", 5, 20, 10, key="top_n_search")
+        with f4:
             year_range_q = st.slider(
                 "Rentang tahun",
                 min_value=min_year,
@@ -1013,41 +1266,57 @@ if page == "🎯 REKOMENDASI":
 
         if search_btn:
             if not query.strip():
+                forget_results("query")
                 ui_alert("warning", "Masukkan kata kunci dulu 🙂")
             else:
+                cache_key = (
+                    model_version, "query", _normalize_text(query), type_filter, rating_filter,
+                    year_min_q, year_max_q, top_n_q, score_space,
+                )
                 with st.spinner("Mencari konten yang sesuai..."):
-                    recs_q = recommend_by_query(
-                        query=query,
-                        df=df,
-                        vectorizer=vectorizer,
-                        tfidf_matrix=tfidf_matrix,
-                        top_n=top_n_q,
-                        type_filter=type_filter if type_filter != "All" else "All",
-                        year_min=year_min_q,
-                        year_max=year_max_q,
-                    )
-
-                if recs_q.empty:
-                    ui_alert("error", "Tidak ada hasil. Coba keyword bahasa Inggris yang lebih umum.")
-                else:
-                    ui_alert("success", f"Ditemukan <b>{len(recs_q)}</b> hasil teratas.")
-                    for i, (_, r) in enumerate(recs_q.iterrows(), 1):
-                        display_recommendation_card(r, i)
+                    recs_q = result_cache.get_or_compute(
+                        cache_key,
+                        timed_call("recommend_by_query", lambda: recommend_by_query(
+                            query=query,
+                            df=df,
+                            vectorizer=vectorizer,
+                            tfidf_matrix=tfidf_matrix,
+                            top_n=top_n_q,
+                            type_filter=type_filter if type_filter != "All" else "All",
+                            year_min=year_min_q,
+                            year_max=year_max_q,
+                            dense_model=dense_model,
+                            inverted_index=inverted_index,
+                            meta_index=meta_index,
+                            rating_filter=rating_filter,
+                            field_scorer=field_scorer,
+                        )),
+                    ).copy()
+                remember_results("query", model_version, recs_q)
+
+        shown = recall_results("query", model_version)
+        if shown is not None:
+            recs_q = shown["recs"]
+            if recs_q.empty:
+                ui_alert("error", "Tidak ada hasil. Coba keyword bahasa Inggris yang lebih umum.")
+            else:
+                ui_alert("success", f"Ditemukan <b>{len(recs_q)}</b> hasil teratas.")
+                with REGISTRY.timed("render_cards", tab="query"):
+                    render_result_page("query", recs_q)
 
     # -------------------------
-    # TAB 3: POPULAR
+    # TAB 4: POPULAR
     # -------------------------
-    with tabs[2]:
+    with tabs[3]:
         st.markdown("## ⭐ Konten Populer (Sampling)")
-        sample_size = min(8, len(df))
-        sample_df = df.sample(sample_size)
+        # Sampel disimpan per sesi: rerun lain (mis. ganti halaman di tab lain) tidak mengacak ulang.
+        if st.button("🔀 Acak ulang", key="popular_reshuffle_btn") or recall_results("popular", model_version) is None:
+            sample_df = df.sample(min(POPULAR_SAMPLE_SIZE, len(df))).assign(similarity=0.0)
+            remember_results("popular", model_version, sample_df)
 
-        cols = st.columns(2)
-        for i, (_, item) in enumerate(sample_df.iterrows()):
-            with cols[i % 2]:
-                tmp = item.copy()
-                tmp["similarity"] = 0.0
-                display_recommendation_card(tmp, i + 1)
+        with REGISTRY.timed("render_cards", tab="popular"):
+            render_result_page("popular", recall_results("popular", model_version)["recs"],
+                               page_size=POPULAR_SAMPLE_SIZE, columns=2)
 
 # =========================================================
 # PAGE: DASHBOARD
@@ -1069,16 +1338,15 @@ elif page == "📊 DASHBOARD ANALITIK":
     c1, c2 = st.columns(2)
     with c1:
         st.markdown("### 🎭 Distribusi Tipe Konten")
-        st.bar_chart(df["type"].value_counts())
+        st.bar_chart(facets["type"])
         st.markdown("### 🌍 Top 10 Negara")
-        st.bar_chart(split_and_count(df["country"], sep=",", top_k=10))
+        st.bar_chart(facets["country"].head(10))
 
     with c2:
         st.markdown("### 🎬 Top 10 Genre")
-        st.bar_chart(split_and_count(df["listed_in"], sep=",", top_k=10))
+        st.bar_chart(facets["listed_in"].head(10))
         st.markdown("### 📅 Tren Tahun Rilis")
-        year_counts = df["release_year"][df["release_year"] > 0].value_counts().sort_index()
-        st.line_chart(year_counts)
+        st.line_chart(facets["release_year"])
 
 # =========================================================
 # PAGE: ABOUT
@@ -1086,14 +1354,21 @@ elif page == "📊 DASHBOARD ANALITIK":
 else:
     st.markdown("## 🤖 Tentang Sistem")
     st.markdown(
-        """
+        f"""
         <div class="glass-panel">
           <h3 style="color:var(--red) !important;">📌 Ringkasan</h3>
           <p style="line-height:1.55;">
             Sistem ini menggunakan <b>Content-Based Filtering</b> menggunakan metadata Netflix
             (judul, genre, cast, director, negara, rating, deskripsi).
             Teks diubah menjadi vektor dengan <b>TF-IDF</b>, lalu kemiripan dihitung dengan
-            <b>Cosine Similarity</b> (via <i>linear_kernel</i>).
+            <b>Cosine Similarity</b>: dot product vektor TF-IDF (sudah ter-normalisasi L2)
+            terhadap matriks sparse katalog.
+          </p>
+          <p style="line-height:1.55;">
+            Mode <b>ANN (SVD + IVF)</b> hanya menyaring kandidat (n_probe daftar IVF terdekat)
+            sebelum skor eksak yang sama, untuk rekomendasi judul &amp; profil. n_probe dipilih
+            per indeks saat build agar recall@{ANN_RECALL_K} &ge; {ANN_RECALL_TARGET:g} pada sampel
+            judul; bila tidak tercapai, ANN tidak dipakai. {ann_about}
           </p>
         </div>
         """,
@@ -1116,3 +1391,31 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+# =========================================================
+# METRIK & DIAGNOSTIK
+# =========================================================
+REGISTRY.observe("script_run", time.perf_counter() - SCRIPT_START, page=page.split(" ", 1)[-1].lower())
+for stat in ("hits", "misses", "evictions", "expirations"):
+    REGISTRY.set_total(f"result_cache_{stat}_total", result_cache.stats()[stat])
+REGISTRY.write_prometheus()
+
+with st.sidebar:
+    if st.checkbox("🩺 Tampilkan diagnostik", value=False, key="show_diagnostics"):
+        st.markdown('<div class="sidebar-title">🩺 DIAGNOSTIK</div>', unsafe_allow_html=True)
+        snapshot = pd.DataFrame(REGISTRY.snapshot())
+        if not snapshot.empty:
+            st.dataframe(snapshot.round(2), hide_index=True)
+        model_fp = model_footprint(vectorizer, tfidf_matrix)
+        model_text = (
+            f"{model_fp['vocabulary_size']:,} fitur, nnz {model_fp['nnz']:,}, "
+            f"{(model_fp['matrix_bytes'] + model_fp['vocabulary_bytes']) / 2**20:.1f} MB"
+        )
+        if MATRIX_BUDGET_MB > 0:
+            st.caption(
+                f"Model TF-IDF dipangkas ke anggaran {MATRIX_BUDGET_MB:g} MB (NETFLIX_MATRIX_BUDGET_MB): "
+                f"{model_text}; term tersisa ber-df {model_fp['min_df']:,}–{model_fp['max_df']:,}."
+            )
+        else:
+            st.caption(f"Model TF-IDF tanpa anggaran (tidak dipangkas): {model_text}.")
+        st.caption(f"Metrik Prometheus (proses ini): {metrics_path()}")
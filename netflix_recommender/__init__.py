@@ -0,0 +1,4 @@
+"""Mesin rekomendasi Netflix (content-based TF-IDF), terpisah dari UI Streamlit."""
+from netflix_recommender.recommender import Recommender
+
+__all__ = ["Recommender"]
@@ -0,0 +1,217 @@
+"""Job batch "judul serupa" untuk seluruh katalog, tanpa Streamlit.
+
+Top-N tiap judul dihitung per blok baris lewat perkalian sparse matriks-matriks,
+blok dibagi ke process pool, dan hasil ditulis bertahap ke Parquet/CSV.
+Dengan `--neighbor-table`, tabel tetangga (top-`NEIGHBOR_K`) yang dipakai
+`recommend_by_index` dibangun di sini dan disimpan ke artefak dataset; app &
+server tidak pernah menghitung tabel O(N²) ini saat start.
+
+Contoh:
+    python -m netflix_recommender.batch --out similar_titles.parquet --top-n 10 --workers 8
+    python -m netflix_recommender.batch --neighbor-table --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    NEIGHBOR_BLOCK_BYTES,
+    NEIGHBOR_K,
+    _file_format,
+    compute_neighbor_table,
+    neighbor_block_rows,
+    save_neighbor_table,
+)
+from netflix_recommender.recommender import Recommender
+
+# Jumlah baris output yang ditampung sebelum ditulis sebagai satu row group Parquet.
+WRITE_BUFFER_ROWS = 500_000
+
+_worker_matrix = None
+_worker_matrix_t = None
+
+def _init_worker(tfidf_matrix) -> None:
+    # Matriks dikirim sekali per proses; transpose disiapkan sekali juga.
+    global _worker_matrix, _worker_matrix_t
+    _worker_matrix = tfidf_matrix
+    _worker_matrix_t = tfidf_matrix.T.tocsr()
+
+def _score_block(task):
+    start, stop, top_n, block_bytes = task
+    idx, sim = compute_neighbor_table(
+        _worker_matrix,
+        k=top_n,
+        block_bytes=block_bytes,
+        rows=np.arange(start, stop),
+        matrix_t=_worker_matrix_t,
+    )
+    return start, idx, sim
+
+def load_catalog_model(data_path: Path, use_artifacts: bool = True, workers: int = 1):
+    """(df, tfidf_matrix) dari artefak di disk bila ada, kalau tidak fit dari dataset."""
+    rec = Recommender.load(data_path, use_artifacts=use_artifacts, save=False, neighbor_k=None, workers=workers)
+    if rec is None:
+        return pd.DataFrame(), None
+    return rec.df, rec.tfidf_matrix
+
+def iter_similar_blocks(
+    tfidf_matrix,
+    top_n: int = 10,
+    workers: int = 1,
+    block_bytes: int = NEIGHBOR_BLOCK_BYTES,
+) -> Iterator[tuple]:
+    """Yield (start, indices [b, top_n], scores [b, top_n]) per blok baris, berurutan.
+
+    Puncak memori skor per blok dibatasi `block_bytes` di setiap proses (`neighbor_block_rows`).
+    """
+    n_rows = tfidf_matrix.shape[0]
+    block_rows = neighbor_block_rows(n_rows, block_bytes)
+    tasks = [(s, min(s + block_rows, n_rows), top_n, block_bytes) for s in range(0, n_rows, block_rows)]
+
+    if workers <= 1:
+        _init_worker(tfidf_matrix)
+        yield from map(_score_block, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tfidf_matrix,)) as pool:
+        yield from pool.map(_score_block, tasks)
+
+def build_neighbor_table(
+    tfidf_matrix,
+    k: int = NEIGHBOR_K,
+    workers: int = 1,
+    block_bytes: int = NEIGHBOR_BLOCK_BYTES,
+) -> tuple:
+    """Tabel tetangga seluruh katalog (setara `compute_neighbor_table`), dihitung per blok di pool worker."""
+    n_rows = tfidf_matrix.shape[0]
+    k = max(0, min(k, n_rows - 1))
+    nbr_idx = np.empty((n_rows, k), dtype=np.int32)
+    nbr_sim = np.empty((n_rows, k), dtype=np.float32)
+    for start, idx, sim in iter_similar_blocks(tfidf_matrix, k, workers, block_bytes):
+        nbr_idx[start : start + len(idx)], nbr_sim[start : start + len(idx)] = idx, sim
+    return nbr_idx, nbr_sim
+
+def _block_frame(show_ids: np.ndarray, start: int, idx: np.ndarray, sim: np.ndarray) -> pd.DataFrame:
+    n_rows, k = idx.shape
+    return pd.DataFrame(
+        {
+            "show_id": np.repeat(show_ids[start : start + n_rows], k),
+            "rank": np.tile(np.arange(1, k + 1, dtype=np.int16), n_rows),
+            "similar_show_id": show_ids[idx.ravel()],
+            "similarity": sim.ravel(),
+        }
+    )
+
+def write_similar_titles(
+    df: pd.DataFrame,
+    tfidf_matrix,
+    out_path: Path,
+    top_n: int = 10,
+    workers: int = 1,
+    block_bytes: int = NEIGHBOR_BLOCK_BYTES,
+) -> int:
+    """Tulis top-N judul serupa seluruh katalog ke Parquet/CSV (format dari ekstensi).
+
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    out_path = Path(out_path)
+    show_ids = df["show_id"].astype(str).to_numpy(dtype=object)
+    as_parquet = _file_format(str(out_path)) == "parquet"
+    writer = None
+    buffer = []
+    buffered = 0
+    written = 0
+
+    def flush() -> None:
+        nonlocal writer, buffer, buffered, written
+        if not buffer:
+            return
+        frame = pd.concat(buffer, ignore_index=True)
+        if as_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, table.schema)
+            writer.write_table(table)
+        else:
+            frame.to_csv(out_path, mode="a" if written else "w", header=not written, index=False)
+        written += len(frame)
+        buffer, buffered = [], 0
+
+    try:
+        for start, idx, sim in iter_similar_blocks(tfidf_matrix, top_n, workers, block_bytes):
+            buffer.append(_block_frame(show_ids, start, idx, sim))
+            buffered += idx.size
+            if buffered >= WRITE_BUFFER_ROWS:
+                flush()
+        flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hitung top-N judul serupa untuk seluruh katalog.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH, help="dataset CSV/Parquet/Feather")
+    parser.add_argument("--out", type=Path, help="file output .parquet atau .csv")
+    parser.add_argument("--neighbor-table", action="store_true",
+                        help=f"bangun tabel tetangga (top-{NEIGHBOR_K}) dan simpan ke artefak dataset")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--block-mb", type=int, default=NEIGHBOR_BLOCK_BYTES // (1024 * 1024),
+                        help="batas memori puncak skor per blok per proses (MB)")
+    parser.add_argument("--no-artifacts", action="store_true", help="selalu fit ulang, abaikan artefak di disk")
+    args = parser.parse_args(argv)
+    if args.out is None and not args.neighbor_table:
+        parser.error("butuh --out dan/atau --neighbor-table")
+
+    t0 = time.perf_counter()
+    # Tabel tetangga disimpan ke artefak, jadi artefaknya harus ada di disk.
+    rec = Recommender.load(args.data, use_artifacts=not args.no_artifacts, save=args.neighbor_table,
+                           workers=args.workers)
+    if rec is None:
+        print(f"Dataset kosong / tidak valid: {args.data}", file=sys.stderr)
+        return 1
+    t1 = time.perf_counter()
+    model_s = t1 - t0
+    block_bytes = args.block_mb * 1024 * 1024
+
+    if args.neighbor_table:
+        neighbors = build_neighbor_table(rec.tfidf_matrix, workers=args.workers, block_bytes=block_bytes)
+        if not save_neighbor_table(rec.fingerprint, neighbors):
+            print("Gagal menyimpan tabel tetangga ke artefak.", file=sys.stderr)
+            return 1
+        t2 = time.perf_counter()
+        print(f"{len(rec):,} judul, tabel tetangga top-{neighbors[0].shape[1]} -> artefak "
+              f"(model {model_s:.1f}s, skor {t2 - t1:.1f}s, {args.workers} worker)", file=sys.stderr)
+        t1 = t2
+
+    if args.out is not None:
+        written = write_similar_titles(
+            rec.df,
+            rec.tfidf_matrix,
+            args.out,
+            top_n=args.top_n,
+            workers=args.workers,
+            block_bytes=block_bytes,
+        )
+        t2 = time.perf_counter()
+        print(
+            f"{len(rec):,} judul, {written:,} baris -> {args.out} "
+            f"(model {model_s:.1f}s, skor {t2 - t1:.1f}s, {args.workers} worker)",
+            file=sys.stderr,
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
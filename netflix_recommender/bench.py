@@ -0,0 +1,249 @@
+"""Benchmark pipeline data & model di katalog sintetis (10k / 100k / 1M baris).
+
+Katalog sintetis dibentuk dari distribusi `netflix_titles.csv`: kolom kategorikal
+(tipe, rating, tahun, negara, genre) di-bootstrap per kolom, sedangkan judul,
+deskripsi, cast & sutradara disusun ulang dari kumpulan kata/nama aslinya
+sehingga vocabulary ikut tumbuh bersama jumlah baris. Dengan seed yang sama
+hasilnya identik; file CSV di-cache di `--work-dir`.
+
+Setiap tahap diukur waktunya (median/p95 untuk tahap query yang diulang) dan,
+kecuali `--no-memory`, puncak alokasinya lewat tracemalloc pada run terpisah
+agar overhead tracing tidak mengotori angka waktu. Output JSON:
+
+    python -m netflix_recommender.bench --sizes 10000 100000 1000000 --out bench.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    PROJECT_DIR,
+    MetadataIndex,
+    _file_format,
+    build_inverted_index,
+    build_vectorizer_and_matrix,
+    model_footprint,
+    prepare_data,
+    read_catalog,
+    recommend_by_index,
+    recommend_by_query,
+    split_and_count,
+)
+
+BENCH_SIZES = (10_000, 100_000, 1_000_000)
+BENCH_DIR = PROJECT_DIR / ".bench"
+QUERY_REPEAT = 20
+
+BENCH_QUERIES = [
+    "crime drama", "romantic comedy", "documentary music", "space adventure",
+    "family animation", "true story war", "high school friends", "serial killer detective",
+    "cooking competition", "stand up comedy", "zombie apocalypse", "anime action",
+]
+
+# =========================================================
+# KATALOG SINTETIS
+# =========================================================
+def _split_pool(series: pd.Series, sep: Optional[str]) -> np.ndarray:
+    s = series.dropna().astype(str)
+    s = s[~s.str.strip().str.lower().isin({"", "unknown", "nan"})]
+    parts = s.str.split(sep).explode().str.strip()
+    return parts[parts != ""].to_numpy(dtype=object)
+
+def _compose(rng: np.random.Generator, pool: np.ndarray, lengths: np.ndarray, sep: str) -> np.ndarray:
+    """Satu string per baris: `lengths[i]` item acak dari `pool` (sesuai frekuensinya) digabung `sep`."""
+    picks = pool[rng.integers(0, len(pool), size=int(lengths.sum()))]
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return np.array([sep.join(picks[a:b]) for a, b in zip(bounds[:-1], bounds[1:])], dtype=object)
+
+def synthetic_catalog(n_rows: int, seed: int = 0, base_path: Path = DEFAULT_DATA_PATH) -> pd.DataFrame:
+    """Katalog sintetis `n_rows` baris berbentuk sama dengan `netflix_titles.csv`."""
+    base = pd.read_csv(base_path, dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(seed)
+
+    def bootstrap(col: str) -> np.ndarray:
+        return base[col].to_numpy(dtype=object)[rng.integers(0, len(base), size=n_rows)]
+
+    types = bootstrap("type")
+    is_movie = types == "Movie"
+    minutes = rng.integers(60, 180, size=n_rows)
+    seasons = rng.choice([1, 1, 1, 2, 2, 3, 4, 5], size=n_rows)
+    duration = np.where(
+        is_movie,
+        pd.Series(minutes).map(lambda m: f"{m} min").to_numpy(dtype=object),
+        pd.Series(seasons).map(lambda s: f"{s} Season" if s == 1 else f"{s} Seasons").to_numpy(dtype=object),
+    )
+
+    has_director = rng.random(n_rows) < 0.7
+    directors = _compose(rng, _split_pool(base["director"], ","), np.where(has_director, 1, 0), ", ")
+    directors[~has_director] = "Unknown"
+    n_cast = rng.integers(0, 9, size=n_rows)
+    cast = _compose(rng, _split_pool(base["cast"], ","), n_cast, ", ")
+    cast[n_cast == 0] = "Unknown"
+
+    return pd.DataFrame({
+        "show_id": [f"s{i + 1}" for i in range(n_rows)],
+        "type": types,
+        "title": _compose(rng, _split_pool(base["title"], None), rng.integers(1, 5, size=n_rows), " "),
+        "director": directors,
+        "cast": cast,
+        "country": bootstrap("country"),
+        "date_added": bootstrap("date_added"),
+        "release_year": bootstrap("release_year"),
+        "rating": bootstrap("rating"),
+        "duration": duration,
+        "listed_in": bootstrap("listed_in"),
+        "description": _compose(rng, _split_pool(base["description"], None), rng.integers(15, 31, size=n_rows), " "),
+    })
+
+def synthetic_catalog_path(n_rows: int, seed: int = 0, work_dir: Path = BENCH_DIR) -> Path:
+    """Path CSV katalog sintetis; dibuat sekali lalu dipakai ulang."""
+    path = Path(work_dir) / f"synthetic-{n_rows}-seed{seed}.csv"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".csv.tmp")
+        synthetic_catalog(n_rows, seed).to_csv(tmp, index=False)
+        tmp.replace(path)
+    return path
+
+# =========================================================
+# PENGUKURAN
+# =========================================================
+def _summary(times: list) -> dict:
+    t = np.asarray(times)
+    return {
+        "runs": len(t),
+        "min": float(t.min()),
+        "median": float(np.median(t)),
+        "p95": float(np.percentile(t, 95)),
+        "mean": float(t.mean()),
+    }
+
+def measure(fn: Callable[[int], object], repeat: int = 1, memory: bool = True):
+    """Jalankan `fn(i)` sebanyak `repeat` kali (diukur waktunya), plus satu run tracemalloc.
+
+    Mengembalikan (hasil run pertama, dict metrik).
+    """
+    times, result = [], None
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(i)
+        times.append(time.perf_counter() - t0)
+        if i == 0:
+            result = out
+    metrics = {"seconds": _summary(times)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(0)
+            metrics["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return result, metrics
+
+def bench_size(path: Path, repeat: int = QUERY_REPEAT, memory: bool = True, seed: int = 0,
+               fit_workers: int = 1) -> list:
+    """Metrik semua tahap untuk satu katalog."""
+    fmt = _file_format(str(path))
+    results = []
+
+    def record(stage: str, fn: Callable[[int], object], reps: int = 1, **info):
+        print(f"  {stage} ...", file=sys.stderr, flush=True)
+        out, metrics = measure(fn, reps, memory)
+        results.append({"stage": stage, **metrics, **info})
+        return out
+
+    raw = record("load_data_from_path", lambda i: read_catalog(str(path), fmt))
+    df = record("prepare_data", lambda i: prepare_data(raw))
+    vectorizer, tfidf_matrix = record(
+        "build_vectorizer_and_matrix",
+        lambda i: build_vectorizer_and_matrix(df["soup"], workers=fit_workers),
+        workers=fit_workers,
+    )
+    results[-1].update({"n_features": int(tfidf_matrix.shape[1]), **model_footprint(vectorizer, tfidf_matrix)})
+
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(df), size=repeat)
+    years = df["release_year"].to_numpy()
+    meta_index = MetadataIndex.build(df)
+    inverted_index = build_inverted_index(tfidf_matrix)
+
+    def by_index(i: int, **kw):
+        return recommend_by_index(int(rows[i]), df, tfidf_matrix, top_n=10, **kw)
+
+    def by_index_filtered(i: int):
+        y = int(years[rows[i]])
+        return by_index(i, same_type=True, year_min=y - 1, year_max=y, meta_index=meta_index)
+
+    def by_query(i: int, **kw):
+        return recommend_by_query(BENCH_QUERIES[i % len(BENCH_QUERIES)], df, vectorizer, tfidf_matrix, top_n=10, **kw)
+
+    record("recommend_by_index", lambda i: by_index(i, same_type=False), repeat)
+    record("recommend_by_index[type+2y, metadata index]", by_index_filtered, repeat)
+    record("recommend_by_query", by_query, repeat)
+    record("recommend_by_query[postings]", lambda i: by_query(i, inverted_index=inverted_index), repeat)
+    record("split_and_count", lambda i: split_and_count(df["listed_in"], sep=",", top_k=10))
+    return results
+
+def _environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    versions = {"numpy": np.__version__, "pandas": pd.__version__}
+    for name in ("scipy", "sklearn"):
+        try:
+            versions[name] = __import__(name).__version__
+        except Exception:
+            pass
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline rekomendasi di katalog sintetis.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCH_SIZES))
+    parser.add_argument("--out", type=Path, required=True, help="file output JSON")
+    parser.add_argument("--repeat", type=int, default=QUERY_REPEAT, help="jumlah query per tahap rekomendasi")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", type=Path, default=BENCH_DIR, help="cache CSV katalog sintetis")
+    parser.add_argument("--no-memory", action="store_true", help="lewati run tracemalloc (lebih cepat)")
+    parser.add_argument("--fit-workers", type=int, default=1, help="worker fit TF-IDF paralel (1 = serial)")
+    args = parser.parse_args(argv)
+
+    report = {"environment": _environment(), "seed": args.seed, "repeat": args.repeat, "runs": []}
+    for n_rows in args.sizes:
+        print(f"{n_rows:,} baris", file=sys.stderr, flush=True)
+        path = synthetic_catalog_path(n_rows, args.seed, args.work_dir)
+        stages = bench_size(path, repeat=args.repeat, memory=not args.no_memory, seed=args.seed,
+                            fit_workers=args.fit_workers)
+        report["runs"].append({"rows": n_rows, "dataset": path.name, "stages": stages})
+        gc.collect()
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Hasil ditulis ke {args.out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
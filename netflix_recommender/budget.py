@@ -0,0 +1,172 @@
+"""Laporan anggaran memori model TF-IDF: ukuran & dampak ranking per anggaran.
+
+Untuk tiap anggaran (`--budgets`, MB; 0 = tanpa pemangkasan, hanya float32)
+model di-fit lewat `build_vectorizer_and_matrix`, lalu dibandingkan dengan
+model tanpa batas float64 (`TfidfVectorizer.fit_transform` apa adanya):
+ambang df terpilih, ukuran vocabulary, nnz, byte matriks & vocabulary, serta
+overlap@k top-k judul serupa (sampel judul acak) dan top-k hasil kata kunci.
+Baris terakhir: mode dense SVD (`DenseModel.fit` atas model anggaran default)
+dengan ukuran proyeksi & embedding-nya dibanding model sparse yang sama, jumlah
+kandidat & recall hasil kalibrasi, dan overlap jalur kandidat + skor TF-IDF.
+
+    python -m netflix_recommender.budget --report reports/tfidf_budget.md
+    python -m netflix_recommender.budget --rows 100000 --budgets 0 64 32 16 --report reports/tfidf_budget_100k.md
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from netflix_recommender.bench import BENCH_QUERIES, synthetic_catalog_path
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    _file_format,
+    _linear_scores,
+    _new_vectorizer,
+    _top_k,
+    MATRIX_BUDGET_MB,
+    build_vectorizer_and_matrix,
+    compute_neighbor_table,
+    model_footprint,
+    prepare_data,
+    read_catalog,
+)
+from netflix_recommender.dense import DenseModel
+
+REPORT_BUDGETS = (0, 16, 8, 4, 2, 1)
+
+def _query_top_k(vectorizer, tfidf_matrix, queries: list, k: int) -> list:
+    return [_top_k(_linear_scores(vectorizer.transform([q]), tfidf_matrix), k) for q in queries]
+
+def _dense_top_k(dense: DenseModel, tfidf_matrix, q_dense, q_vec, k: int, exclude: int = -1) -> np.ndarray:
+    """Jalur mode dense: kandidat embedding lalu skor eksak TF-IDF (seperti `recommend_by_*`)."""
+    cand = np.sort(dense.candidates(q_dense))
+    cand = cand[cand != exclude]
+    return cand[_top_k(_linear_scores(q_vec, tfidf_matrix[cand]), k)]
+
+def _overlap(found: list, reference: list, k: int) -> float:
+    return float(np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(found, reference)]))
+
+def budget_report(corpus, budgets=REPORT_BUDGETS, k: int = 10, n_queries: int = 500,
+                  random_state: int = 0) -> tuple:
+    """(baseline, baris per anggaran, baris dense): ukuran model & overlap@k terhadap model tanpa batas float64."""
+    t0 = time.perf_counter()
+    base_vectorizer = _new_vectorizer()
+    base_matrix = base_vectorizer.fit_transform(corpus.astype(str).values)
+    baseline = {**model_footprint(base_vectorizer, base_matrix), "fit_s": time.perf_counter() - t0}
+
+    n_rows = base_matrix.shape[0]
+    rng = np.random.default_rng(random_state)
+    rows = np.sort(rng.choice(n_rows, size=min(n_queries, n_rows), replace=False))
+    base_similar = compute_neighbor_table(base_matrix, k=k, rows=rows)[0]
+    base_search = _query_top_k(base_vectorizer, base_matrix, BENCH_QUERIES, k)
+
+    out = []
+    for budget_mb in budgets:
+        t0 = time.perf_counter()
+        vectorizer, tfidf_matrix = build_vectorizer_and_matrix(corpus, budget_mb=budget_mb)
+        fit_s = time.perf_counter() - t0
+        similar = compute_neighbor_table(tfidf_matrix, k=k, rows=rows)[0]
+        out.append({
+            "budget_mb": budget_mb,
+            **model_footprint(vectorizer, tfidf_matrix),
+            "fit_s": fit_s,
+            "similar_overlap": _overlap(list(similar), list(base_similar), similar.shape[1]),
+            "search_overlap": _overlap(_query_top_k(vectorizer, tfidf_matrix, BENCH_QUERIES, k), base_search, k),
+        })
+    t0 = time.perf_counter()
+    vectorizer, tfidf_matrix = build_vectorizer_and_matrix(corpus)
+    dense = DenseModel.fit(tfidf_matrix)
+    dense_row = {
+        "budget_mb": MATRIX_BUDGET_MB,
+        **dense.footprint(),
+        "usable": dense.usable,
+        "sparse_bytes": model_footprint(vectorizer, tfidf_matrix)["matrix_bytes"],
+        "fit_s": time.perf_counter() - t0,
+        "similar_overlap": _overlap(
+            [_dense_top_k(dense, tfidf_matrix, dense.embeddings[r], tfidf_matrix[r], k, exclude=r) for r in rows],
+            list(base_similar), k,
+        ),
+        "search_overlap": _overlap(
+            [_dense_top_k(dense, tfidf_matrix, dense.project(q_vec), q_vec, k)
+             for q_vec in (vectorizer.transform([q]) for q in BENCH_QUERIES)],
+            base_search, k,
+        ),
+    }
+    return baseline, out, dense_row
+
+def _mb(n_bytes: int) -> str:
+    return f"{n_bytes / 2**20:.1f}"
+
+def _report_markdown(data_name: str, n_rows: int, baseline: dict, rows: list, dense: dict,
+                     k: int, n_queries: int) -> str:
+    lines = [
+        "# Anggaran memori model TF-IDF",
+        "",
+        f"- Dataset: `{data_name}` — {n_rows:,} judul",
+        f"- Tanpa batas (float64, indeks int32): {baseline['vocabulary_size']:,} fitur, nnz {baseline['nnz']:,}, "
+        f"matriks {_mb(baseline['matrix_bytes'])} MB + vocabulary {_mb(baseline['vocabulary_bytes'])} MB, "
+        f"fit {baseline['fit_s']:.1f}s",
+        f"- Overlap@{k}: irisan top-{k} dengan model tanpa batas — judul serupa untuk {n_queries} judul acak, "
+        f"kata kunci untuk {len(BENCH_QUERIES)} query `bench.BENCH_QUERIES`",
+        f"- Dibuat: {datetime.now().isoformat(timespec='seconds')}",
+        "",
+        "| anggaran (MB) | min_df | max_df | fitur | nnz | matriks (MB) | vocabulary (MB) "
+        "| total (MB) | fit (s) | overlap judul | overlap kata kunci |",
+        "|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in rows:
+        budget = "tanpa batas" if not r["budget_mb"] else f"{r['budget_mb']:g}"
+        lines.append(
+            f"| {budget} | {r['min_df']} | {r['max_df']:,} | {r['vocabulary_size']:,} | {r['nnz']:,} "
+            f"| {_mb(r['matrix_bytes'])} | {_mb(r['vocabulary_bytes'])} "
+            f"| {_mb(r['matrix_bytes'] + r['vocabulary_bytes'])} | {r['fit_s']:.1f} "
+            f"| {r['similar_overlap']:.3f} | {r['search_overlap']:.3f} |"
+        )
+    dense_budget = "tanpa batas" if not dense["budget_mb"] else f"{dense['budget_mb']:g} MB"
+    lines += [
+        "",
+        f"## Dense SVD (anggaran {dense_budget})",
+        "",
+        "| fitur terproyeksi | dim | proyeksi (MB) | embedding (MB) | total dense (MB) | matriks sparse (MB) "
+        "| fit (s) | kandidat | recall kalibrasi | dipakai app | overlap judul | overlap kata kunci |",
+        "|---:|---:|---:|---:|---:|---:|---:|---:|---:|---|---:|---:|",
+        f"| {dense['features']:,} | {dense['dim']} | {_mb(dense['projection_bytes'])} "
+        f"| {_mb(dense['embedding_bytes'])} | {_mb(dense['projection_bytes'] + dense['embedding_bytes'])} "
+        f"| {_mb(dense['sparse_bytes'])} | {dense['fit_s']:.1f} "
+        f"| {dense['n_candidates']:,} | {dense['recall']:.3f} | {'ya' if dense['usable'] else 'tidak'} "
+        f"| {dense['similar_overlap']:.3f} | {dense['search_overlap']:.3f} |",
+    ]
+    return "\n".join(lines) + "\n"
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ukuran model TF-IDF & overlap ranking per anggaran memori.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH)
+    parser.add_argument("--rows", type=int, help="pakai katalog sintetis sebanyak ini (lihat bench)")
+    parser.add_argument("--budgets", type=float, nargs="+", default=list(REPORT_BUDGETS))
+    parser.add_argument("--report", type=Path, required=True, help="file output Markdown")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    path = synthetic_catalog_path(args.rows) if args.rows else args.data
+    df = prepare_data(read_catalog(str(path), _file_format(str(path))))
+    if df.empty:
+        print(f"Dataset kosong / tidak valid: {path}", file=sys.stderr)
+        return 1
+
+    baseline, rows, dense = budget_report(df["soup"], args.budgets, k=args.k, n_queries=args.queries)
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(
+        _report_markdown(path.name, len(df), baseline, rows, dense, args.k, min(args.queries, len(df))),
+        encoding="utf-8",
+    )
+    print(f"Laporan ditulis ke {args.report}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Cache hasil rekomendasi lintas sesi (LRU berbatas ukuran + TTL).
+
+Kunci dibentuk pemanggil dan wajib memuat versi model, sehingga hasil dari
+dataset lain tidak pernah tertukar; `invalidate(version)` membuang entri versi
+lama secara eksplisit saat dataset berganti.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+RESULT_CACHE_SIZE = 512
+RESULT_CACHE_TTL = 15 * 60  # detik
+
+_MISSING = object()
+
+class ResultCache:
+    """LRU thread-safe dengan TTL; kunci berupa tuple dengan versi model di posisi pertama."""
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, ttl: Optional[float] = RESULT_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires is not None and expires <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        # Dihitung di luar lock: dua sesi bisa menghitung kunci yang sama bersamaan,
+        # tapi sesi lain tidak pernah menunggu satu query lambat.
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, version: Optional[str] = None) -> int:
+        """Buang entri milik `version` (None = semua); kembalikan jumlah entri yang dibuang."""
+        with self._lock:
+            if version is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [k for k in self._entries if k[0] == version]
+            for k in stale:
+                del self._entries[k]
+            return len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
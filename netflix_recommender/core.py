@@ -0,0 +1,1479 @@
+"""Logika data & model rekomendasi Netflix yang tidak bergantung pada Streamlit.
+
+Dipakai oleh `app.py` (dibungkus cache Streamlit) dan oleh job batch
+`python -m netflix_recommender.batch`.
+
+scikit-learn hanya diimpor di jalur fit; memuat artefak dan menjawab query
+cukup numpy/scipy/pandas (lihat `FrozenTfidfVectorizer`).
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from scipy import sparse
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_DATA_PATH = PROJECT_DIR / "netflix_titles.csv"
+ARTIFACT_DIR = PROJECT_DIR / ".artifacts"
+
+# =========================================================
+# TEXT HELPERS
+# =========================================================
+_EMPTY_TOKENS = {"unknown", "nan", "none", "null", ""}
+SOUP_COLUMNS = ["title", "type", "director", "cast", "country", "listed_in", "rating", "description"]
+
+def _normalize_text(x: object) -> str:
+    if x is None:
+        return ""
+    if isinstance(x, float) and np.isnan(x):
+        return ""
+    s = str(x).strip()
+    if s.lower() in _EMPTY_TOKENS:
+        return ""
+    s = s.replace("&", " and ")
+    s = s.lower()
+    s = re.sub(r"[^0-9a-z]+", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+def _normalize_series(s: pd.Series) -> pd.Series:
+    """Versi vektor dari `_normalize_text` untuk satu kolom (hasil identik per sel).
+
+    Dijalankan di atas dtype object agar strip/lower/regex memakai semantik
+    Python yang sama dengan `_normalize_text` (mis. "İ".lower()). Kolom
+    category cukup dinormalisasi per kategori lalu disebar lewat kode.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        categories = _normalize_series(pd.Series(s.cat.categories.astype(object))).to_numpy(dtype=object)
+        codes = s.cat.codes.to_numpy()
+        out = np.append(categories, "")[codes]  # kode -1 (NaN) -> elemen terakhir ""
+        return pd.Series(out, index=s.index, dtype=object)
+    low = s.fillna("").astype(str).astype(object).str.strip().str.lower()
+    empty = low.isin(_EMPTY_TOKENS)
+    out = (
+        low.str.replace("&", " and ", regex=False)
+        .str.replace(r"[^0-9a-z]+", " ", regex=True)
+        .str.strip()
+    )
+    return out.mask(empty, "")
+
+def _safe_str(x: object) -> str:
+    if x is None:
+        return ""
+    if isinstance(x, float) and np.isnan(x):
+        return ""
+    s = str(x)
+    if s.strip().lower() in _EMPTY_TOKENS:
+        return ""
+    return s
+
+# =========================================================
+# DATA LOADING
+# =========================================================
+COLUMN_ALIASES = {
+    "show id": "show_id",
+    "show_id": "show_id",
+    "type": "type",
+    "title": "title",
+    "director": "director",
+    "cast": "cast",
+    "country": "country",
+    "date_added": "date_added",
+    "release year": "release_year",
+    "release_year": "release_year",
+    "rating": "rating",
+    "duration": "duration",
+    "listed in": "listed_in",
+    "listed_in": "listed_in",
+    "description": "description",
+}
+EXPECTED_COLUMNS = ["show_id","type","title","director","cast","country","release_year","rating","duration","listed_in","description"]
+# Kolom berkardinalitas rendah dibaca sebagai category (hemat memori saat ingest).
+CATEGORY_COLUMNS = {"type", "rating"}
+# Frame ringkas setelah fit: kolom ini jadi category bila nilai uniknya <= rasio x baris;
+# `soup` (hanya untuk fit) & `display_title` (turunan) tidak disimpan per baris.
+COMPACT_CATEGORY_COLUMNS = ("type", "rating", "country", "listed_in", "duration")
+COMPACT_CATEGORY_MAX_RATIO = 0.5
+COMPACT_DROP_COLUMNS = ("soup", "display_title")
+INGEST_CHUNK_ROWS = 100_000
+UPLOAD_TYPES = ["csv", "parquet", "feather"]
+
+def _file_format(name: str) -> str:
+    suffix = Path(name).suffix.lower()
+    if suffix in {".parquet", ".pq"}:
+        return "parquet"
+    if suffix in {".feather", ".arrow"}:
+        return "feather"
+    return "csv"
+
+def _ingest_columns(names) -> dict:
+    """Kolom asli yang dipakai `prepare_data` -> dtype eksplisitnya."""
+    dtypes = {}
+    for name in names:
+        canonical = COLUMN_ALIASES.get(str(name).strip().lower())
+        if canonical in EXPECTED_COLUMNS:
+            dtypes[name] = "category" if canonical in CATEGORY_COLUMNS else str
+    return dtypes
+
+def _compact_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Chunk CSV langsung diringkas saat tiba: tahun rilis jadi angka (bukan string)."""
+    for col in chunk.columns:
+        if COLUMN_ALIASES.get(str(col).strip().lower()) == "release_year":
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+    return chunk
+
+def _concat_chunks(chunks: list) -> pd.DataFrame:
+    """Gabung chunk per kolom; tiap kolom dilepas dari chunk begitu digabung.
+
+    Puncak memori = chunk yang tersisa + satu kolom gabungan, bukan dua salinan
+    seluruh frame seperti `pd.concat(chunks)`. Kolom category digabung lewat
+    `union_categoricals` (tetap category, kode kecil).
+    """
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    columns = {}
+    for col in list(chunks[0].columns):
+        parts = [c.pop(col) for c in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals(parts), name=col)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+        del parts
+    return pd.DataFrame(columns)
+
+def read_catalog(source, fmt: str = "csv", chunk_rows: int = INGEST_CHUNK_ROWS) -> pd.DataFrame:
+    """Baca katalog (path atau file-like) hanya dengan kolom yang dibutuhkan.
+
+    CSV dibaca per chunk dengan dtype eksplisit dan tiap chunk diringkas saat
+    tiba (`_compact_chunk`); Parquet/Feather dibaca langsung per kolom lewat pyarrow.
+    """
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        names = pq.ParquetFile(source).schema_arrow.names
+        dtypes = _ingest_columns(names)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        df = pd.read_parquet(source, columns=list(dtypes))
+    elif fmt == "feather":
+        import pyarrow as pa
+
+        names = pa.ipc.open_file(source).schema.names
+        dtypes = _ingest_columns(names)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        df = pd.read_feather(source, columns=list(dtypes))
+    else:
+        names = pd.read_csv(source, nrows=0).columns
+        dtypes = _ingest_columns(names)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        reader = pd.read_csv(source, usecols=list(dtypes), dtype=dtypes, chunksize=chunk_rows)
+        with reader:
+            return _concat_chunks([_compact_chunk(chunk) for chunk in reader])
+
+    for col, dtype in dtypes.items():
+        if dtype == "category":
+            df[col] = df[col].astype("category")
+    return df
+
+def prepare_data(raw: pd.DataFrame) -> pd.DataFrame:
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+
+    df = raw.copy()
+    df.columns = df.columns.str.strip().str.lower()
+
+    for old_name, new_name in COLUMN_ALIASES.items():
+        if old_name in df.columns and new_name not in df.columns:
+            df[new_name] = df[old_name]
+
+    for col in EXPECTED_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+
+    for col in CATEGORY_COLUMNS:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+
+    df["type"] = df["type"].astype(str).str.strip()
+    type_lower = df["type"].str.lower()
+    df.loc[type_lower == "tv show", "type"] = "TV Show"
+    df.loc[type_lower == "movie", "type"] = "Movie"
+
+    text_cols = ["type","title","director","cast","country","rating","duration","listed_in","description"]
+    for c in text_cols:
+        df[c] = df[c].fillna("").astype(str)
+        df[c] = df[c].replace({"unknown": "", "Unknown": "", "nan": "", "NaN": "", "None": "", "none": ""})
+
+    df["release_year"] = pd.to_numeric(df["release_year"], errors="coerce").fillna(0).astype(int)
+
+    df["soup"] = build_soup(df)
+    df["display_title"] = _display_titles(df)
+
+    if df["show_id"].astype(str).duplicated().any():
+        df["show_id"] = df["show_id"].map(str) + "_" + df.index.map(str)
+
+    return df
+
+def build_soup(df: pd.DataFrame) -> pd.Series:
+    """Dokumen TF-IDF per baris: gabungan `SOUP_COLUMNS` yang dinormalisasi."""
+    soup = _normalize_series(df[SOUP_COLUMNS[0]])
+    for c in SOUP_COLUMNS[1:]:
+        soup = soup + " " + _normalize_series(df[c])
+    return soup.str.strip().astype(str)
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame siap pakai versi hemat memori untuk disajikan setelah fit.
+
+    Kolom di `COMPACT_CATEGORY_COLUMNS` menjadi category (kode int8/int16 +
+    satu salinan tiap nilai), `release_year` int16, dan `COMPACT_DROP_COLUMNS`
+    dibuang: `soup` bisa dibentuk ulang lewat `build_soup`, `display_title`
+    lewat `_display_titles`. Nilai sel tidak berubah.
+    """
+    out = df.drop(columns=[c for c in COMPACT_DROP_COLUMNS if c in df.columns])
+    for c in COMPACT_CATEGORY_COLUMNS:
+        if c in out.columns and not isinstance(out[c].dtype, pd.CategoricalDtype):
+            if out[c].nunique() <= COMPACT_CATEGORY_MAX_RATIO * len(out):
+                out[c] = out[c].astype("category")
+    if "release_year" in out.columns:
+        years = out["release_year"]
+        info = np.iinfo(np.int16)
+        if len(years) == 0 or (years.min() >= info.min and years.max() <= info.max):
+            out["release_year"] = years.astype(np.int16)
+    return out
+
+def frame_memory(df: pd.DataFrame) -> pd.DataFrame:
+    """Memori per kolom (termasuk isi string Python): dtype, byte, byte per baris; baris terakhir total."""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        "dtype": [str(df[c].dtype) for c in usage.index],
+        "bytes": usage.to_numpy(),
+    }, index=usage.index)
+    report.loc["total"] = ["", int(usage.sum())]
+    report["bytes_per_row"] = report["bytes"].astype(float) / max(len(df), 1)
+    return report
+
+def _display_titles(df: pd.DataFrame) -> pd.Series:
+    """"Judul (Tipe, Tahun)", ditambah show_id bila ada judul kembar."""
+    display = df["title"].astype(str) + " (" + df["type"].astype(str) + ", " + df["release_year"].astype(str) + ")"
+    dup = display.duplicated(keep=False)
+    if dup.any():
+        display = display.where(~dup, display + " — " + df["show_id"].map(str))
+    return display
+
+# =========================================================
+# MODEL (TF-IDF)
+# =========================================================
+VECTORIZER_PARAMS = {
+    "stop_words": "english",
+    "ngram_range": (1, 2),
+    "min_df": 1,
+    "max_df": 0.95,
+    "sublinear_tf": True,
+}
+
+def _new_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(**VECTORIZER_PARAMS)
+
+# Di bawah jumlah dokumen ini overhead process pool lebih besar dari hasilnya.
+PARALLEL_FIT_MIN_ROWS = 20_000
+FIT_WORKERS = os.cpu_count() or 1
+# Worker fit dimulai lewat loky (fork+exec, tanpa menjalankan ulang __main__), bukan
+# fork: fit bisa dipanggil dari thread Streamlit, dan fork dari proses multi-thread
+# bisa mewarisi lock yang sedang terkunci.
+FIT_BACKEND = "loky"
+
+# Anggaran memori model TF-IDF (matriks CSR + vocabulary + idf) dalam MB; 0 = tanpa batas.
+# Opt-in: pemangkasan mengubah hasil rekomendasi, jadi default-nya mati.
+MATRIX_BUDGET_MB = float(os.environ.get("NETFLIX_MATRIX_BUDGET_MB", "0"))
+# min_df dinaikkan paling jauh sampai sini; sisanya dipangkas dari term paling umum.
+BUDGET_MAX_MIN_DF = 5
+
+def build_vectorizer_and_matrix(corpus: pd.Series, workers: int = 1, budget_mb: float = MATRIX_BUDGET_MB,
+                                min_rows: int = PARALLEL_FIT_MIN_ROWS):
+    """Fit TF-IDF atas `corpus`; dengan `workers` > 1 tokenisasi & hitung term dibagi ke process pool.
+
+    Korpus di bawah `min_rows` dokumen selalu di-fit serial, berapa pun `workers`.
+    Jalur paralel mengembalikan `FrozenTfidfVectorizer` dengan vocabulary, idf
+    dan matriks yang setara dengan jalur serial (`TfidfVectorizer.fit_transform`).
+    Bila model melebihi `budget_mb`, term dipangkas lewat ambang document
+    frequency (`prune_to_budget`). Matriks disimpan float32 dengan indeks int32.
+    """
+    if corpus is None or len(corpus) == 0:
+        return None, None
+    if corpus.astype(str).str.strip().eq("").all():
+        return None, None
+
+    docs = corpus.astype(str).values
+    if workers > 1 and len(docs) >= min_rows:
+        vectorizer, tfidf_matrix = _fit_parallel(docs, workers)
+    else:
+        vectorizer = _new_vectorizer()
+        tfidf_matrix = vectorizer.fit_transform(docs)
+    if budget_mb and budget_mb > 0:
+        vectorizer, tfidf_matrix = prune_to_budget(vectorizer, tfidf_matrix, int(budget_mb * 2**20))
+    return vectorizer, compact_csr(tfidf_matrix)
+
+def compact_csr(matrix):
+    """CSR dengan data float32 dan indeks int32 (int64 hanya bila nnz tidak muat)."""
+    index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+    out = sparse.csr_matrix(
+        (matrix.data.astype(np.float32, copy=False), matrix.indices.astype(index_dtype, copy=False),
+         matrix.indptr.astype(index_dtype, copy=False)),
+        shape=matrix.shape,
+    )
+    out.has_sorted_indices = matrix.has_sorted_indices
+    return out
+
+def _term_bytes(vectorizer) -> tuple:
+    """(term per kolom, panjang UTF-8 tiap term) dari vocabulary dict / `SortedVocabulary`."""
+    vocab = vectorizer.vocabulary_
+    terms = np.empty(len(vocab), dtype=object)
+    if isinstance(vocab, SortedVocabulary):
+        terms[vocab.ids] = [t.decode("utf-8") for t in vocab.terms]
+    else:
+        terms[np.fromiter(vocab.values(), dtype=np.int64, count=len(vocab))] = list(vocab)
+    return terms, np.fromiter((len(t.encode("utf-8")) for t in terms), dtype=np.int64, count=len(terms))
+
+def model_footprint(vectorizer, tfidf_matrix) -> dict:
+    """Ukuran vocabulary, nnz & byte model seperti disajikan (CSR + `SortedVocabulary` + idf)."""
+    _, lengths = _term_bytes(vectorizer)
+    doc_freq = np.bincount(tfidf_matrix.indices, minlength=tfidf_matrix.shape[1])
+    matrix_bytes = tfidf_matrix.data.nbytes + tfidf_matrix.indices.nbytes + tfidf_matrix.indptr.nbytes
+    vocabulary_bytes = len(lengths) * (int(lengths.max(initial=0)) + 4) + vectorizer.idf_.nbytes
+    return {
+        "vocabulary_size": int(len(lengths)),
+        "nnz": int(tfidf_matrix.nnz),
+        "matrix_bytes": int(matrix_bytes),
+        "vocabulary_bytes": int(vocabulary_bytes),
+        "min_df": int(doc_freq.min()) if len(doc_freq) else 0,
+        "max_df": int(doc_freq.max(initial=0)),
+    }
+
+def _budget_thresholds(doc_freq: np.ndarray, width: int, n_rows: int, budget_bytes: int) -> tuple:
+    """(min_df, max_df) dalam jumlah dokumen agar model setelah pemangkasan muat di `budget_bytes`.
+
+    Biaya = 8 byte per nnz (float32 + int32) + indptr + tiap term (lebar `SortedVocabulary`,
+    id int32, idf float64). Pertama min_df dinaikkan (buang term langka, mis. bigram
+    singleton) hingga `BUDGET_MAX_MIN_DF`; bila belum cukup, term dengan df tertinggi
+    (idf terendah, postings terpanjang) dibuang.
+    """
+    top = int(doc_freq.max(initial=0))
+    n_terms = np.cumsum(np.bincount(doc_freq, minlength=top + 1))
+    n_nnz = np.cumsum(np.bincount(doc_freq, weights=doc_freq, minlength=top + 1))
+    fixed, per_term = 4 * (n_rows + 1), width + 4 + 8
+
+    def cost(lo: int, hi):
+        return fixed + 8 * (n_nnz[hi] - n_nnz[lo - 1]) + per_term * (n_terms[hi] - n_terms[lo - 1])
+
+    for lo in range(1, min(BUDGET_MAX_MIN_DF, top) + 1):
+        if cost(lo, top) <= budget_bytes:
+            return lo, top
+    lo = min(BUDGET_MAX_MIN_DF, max(top, 1))
+    highs = np.arange(lo, top + 1)
+    fits = highs[cost(lo, highs) <= budget_bytes]
+    if len(fits) == 0:
+        raise ValueError(f"Anggaran {budget_bytes / 2**20:.1f} MB terlalu kecil untuk {n_rows:,} dokumen.")
+    return lo, int(fits[-1])
+
+def prune_to_budget(vectorizer, tfidf_matrix, budget_bytes: int):
+    """Pangkas kolom TF-IDF ke ambang df dari `_budget_thresholds`; model yang sudah muat dikembalikan apa adanya.
+
+    idf hanya bergantung pada df term itu sendiri, jadi cukup ambil kolom yang
+    tersisa lalu normalisasi L2 ulang per baris: hasilnya sama dengan fit ulang
+    memakai min_df/max_df tersebut (tanpa tokenisasi ulang).
+    """
+    terms, lengths = _term_bytes(vectorizer)
+    doc_freq = np.bincount(tfidf_matrix.indices, minlength=tfidf_matrix.shape[1])
+    n_rows = tfidf_matrix.shape[0]
+    min_df, max_df = _budget_thresholds(doc_freq, int(lengths.max(initial=0)), n_rows, budget_bytes)
+    kept = np.flatnonzero((doc_freq >= min_df) & (doc_freq <= max_df))
+    if len(kept) == len(doc_freq):
+        return vectorizer, tfidf_matrix
+
+    matrix = sparse.csr_matrix(tfidf_matrix)[:, kept].tocsr()
+    matrix.sort_indices()
+    row_of = np.repeat(np.arange(n_rows), np.diff(matrix.indptr))
+    norms = np.sqrt(np.bincount(row_of, weights=matrix.data.astype(np.float64) ** 2, minlength=n_rows))
+    matrix.data = matrix.data / norms[row_of]
+
+    frozen = FrozenTfidfVectorizer.from_vectorizer(vectorizer)
+    pruned = FrozenTfidfVectorizer(
+        dict(zip(terms[kept].tolist(), range(len(kept)))), frozen.idf_[kept], frozen.stop_words,
+    )
+    return pruned, matrix
+
+class SortedVocabulary(Mapping):
+    """Vocabulary term -> kolom di atas array bytes UTF-8 terurut, pengganti dict.
+
+    Array lebar-tetap (`S<n>`) bisa di-mmap dan dibagi antar proses; lookup
+    memakai `np.searchsorted` untuk banyak term sekaligus (`lookup`), sehingga
+    tidak ada dict Python berisi ratusan ribu string di tiap proses.
+    """
+
+    def __init__(self, terms: np.ndarray, ids: np.ndarray):
+        self.terms = terms
+        self.ids = ids
+
+    @classmethod
+    def from_dict(cls, vocabulary: dict) -> "SortedVocabulary":
+        terms = np.array([t.encode("utf-8") for t in vocabulary], dtype=bytes)
+        ids = np.fromiter(vocabulary.values(), dtype=np.int32, count=len(vocabulary))
+        order = np.argsort(terms, kind="stable")
+        return cls(terms[order], ids[order])
+
+    def lookup(self, terms: list) -> np.ndarray:
+        """Kolom tiap term (int32), -1 bila tidak ada di vocabulary."""
+        cols = np.full(len(terms), -1, dtype=np.int32)
+        if not terms or not len(self.terms):
+            return cols
+        width = self.terms.dtype.itemsize
+        encoded = [t.encode("utf-8") for t in terms]
+        # Term lebih panjang dari lebar array pasti tidak ada (dan akan terpotong saat cast).
+        fits = np.flatnonzero(np.fromiter((len(b) <= width for b in encoded), dtype=bool, count=len(encoded)))
+        query = np.array([encoded[i] for i in fits], dtype=self.terms.dtype)
+        pos = np.minimum(np.searchsorted(self.terms, query), len(self.terms) - 1)
+        hit = self.terms[pos] == query
+        cols[fits[hit]] = self.ids[pos[hit]]
+        return cols
+
+    def __getitem__(self, term: str) -> int:
+        col = self.lookup([term])[0]
+        if col < 0:
+            raise KeyError(term)
+        return int(col)
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and self.lookup([term])[0] >= 0
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self):
+        return (t.decode("utf-8") for t in self.terms)
+
+class FrozenTfidfVectorizer:
+    """`transform` TF-IDF dengan vocabulary, idf & stop words beku, tanpa scikit-learn.
+
+    Meniru analyzer `TfidfVectorizer(**VECTORIZER_PARAMS)`: lowercase, token
+    `(?u)\\b\\w\\w+\\b`, buang stop words, n-gram kata 1-2, tf sublinear, idf, L2.
+    """
+
+    _TOKEN = re.compile(r"(?u)\b\w\w+\b")
+
+    def __init__(self, vocabulary: Mapping, idf: np.ndarray, stop_words):
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+        self.stop_words = frozenset(stop_words)
+        self.ngram_range = VECTORIZER_PARAMS["ngram_range"]
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer) -> "FrozenTfidfVectorizer":
+        if isinstance(vectorizer, cls):
+            return vectorizer
+        return cls(vectorizer.vocabulary_, vectorizer.idf_, vectorizer.get_stop_words() or ())
+
+    def get_stop_words(self) -> frozenset:
+        return self.stop_words
+
+    def _terms(self, doc: str) -> list:
+        tokens = [t for t in self._TOKEN.findall(doc.lower()) if t not in self.stop_words]
+        lo, hi = self.ngram_range
+        terms = list(tokens) if lo == 1 else []
+        for n in range(max(lo, 2), hi + 1):
+            terms.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def _columns(self, terms: list) -> np.ndarray:
+        vocab = self.vocabulary_
+        if isinstance(vocab, SortedVocabulary):
+            return vocab.lookup(terms)
+        get = vocab.get
+        return np.fromiter((get(t, -1) for t in terms), dtype=np.int32, count=len(terms))
+
+    def transform(self, docs):
+        terms, indptr = [], [0]
+        for doc in docs:
+            terms.extend(self._terms(str(doc)))
+            indptr.append(len(terms))
+        n_docs = len(indptr) - 1
+        cols = self._columns(terms)
+        keep = cols >= 0
+        rows = np.repeat(np.arange(n_docs), np.diff(indptr))[keep]
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_docs))]).astype(np.int32)
+        m = sparse.csr_matrix((np.ones(int(keep.sum())), cols[keep], indptr), shape=(n_docs, len(self.idf_)))
+        m.sum_duplicates()
+        return _tfidf_weight(m, self.idf_)
+
+def _tfidf_weight(counts, idf: np.ndarray):
+    """Hitungan term (CSR float64) -> TF-IDF: tf sublinear, kali idf, normalisasi L2 per baris (in place)."""
+    counts.data = (np.log(counts.data) + 1.0) * idf[counts.indices]
+    row_of = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    norms = np.sqrt(np.bincount(row_of, weights=counts.data ** 2, minlength=counts.shape[0]))
+    counts.data /= norms[row_of]
+    return counts
+
+def _count_chunk(docs) -> tuple:
+    """Worker: hitung term satu potong dokumen dengan analyzer yang sama dengan jalur serial."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    params = {k: v for k, v in VECTORIZER_PARAMS.items() if k in ("stop_words", "ngram_range")}
+    counter = CountVectorizer(**params)
+    try:
+        counts = counter.fit_transform(docs)
+    except ValueError:
+        # Potongan tanpa term sama sekali (mis. hanya stop words).
+        return np.empty(0, dtype=object), sparse.csr_matrix((len(docs), 0), dtype=np.int64)
+    return counter.get_feature_names_out().astype(object), counts.tocsr()
+
+def _fit_parallel(docs: np.ndarray, workers: int):
+    """Count per potong di process pool, gabung vocabulary & df, lalu TF-IDF seperti sklearn."""
+    from numbers import Integral
+
+    from joblib import Parallel, delayed
+
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    n_docs = len(docs)
+    bounds = np.linspace(0, n_docs, workers + 1).astype(int)
+    chunks = [docs[a:b] for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    # Worker & argumennya (fungsi level modul + array string) harus bisa di-pickle.
+    # multiprocessing "spawn"/"forkserver" menjalankan ulang __main__ di tiap worker,
+    # dan di Streamlit __main__ adalah app.py; worker loky tidak.
+    parts = Parallel(n_jobs=len(chunks), backend=FIT_BACKEND)(delayed(_count_chunk)(c) for c in chunks)
+
+    # Vocabulary gabungan: term tiap potong sudah terurut, jadi argsort stabil (timsort)
+    # atas gabungannya cukup menggabungkan run; id global = urutan alfabet seperti sklearn.
+    all_terms = np.concatenate([terms for terms, _ in parts])
+    order = np.argsort(all_terms, kind="stable")
+    sorted_terms = all_terms[order]
+    first = np.ones(len(sorted_terms), dtype=bool)
+    first[1:] = sorted_terms[1:] != sorted_terms[:-1]
+    global_id = np.empty(len(all_terms), dtype=np.int64)
+    global_id[order] = np.cumsum(first) - 1
+    terms = sorted_terms[first]
+
+    data, indices, indptr = [], [], [np.zeros(1, dtype=np.int64)]
+    offset = 0
+    for chunk_terms, counts in parts:
+        data.append(counts.data)
+        indices.append(global_id[offset : offset + len(chunk_terms)][counts.indices])
+        indptr.append(counts.indptr[1:].astype(np.int64) + indptr[-1][-1])
+        offset += len(chunk_terms)
+    data, indices, indptr = np.concatenate(data), np.concatenate(indices), np.concatenate(indptr)
+
+    # Filter min_df/max_df seperti CountVectorizer._limit_features.
+    doc_freq = np.bincount(indices, minlength=len(terms))
+    max_df, min_df = VECTORIZER_PARAMS["max_df"], VECTORIZER_PARAMS["min_df"]
+    high = max_df if isinstance(max_df, Integral) else max_df * n_docs
+    low = min_df if isinstance(min_df, Integral) else min_df * n_docs
+    kept = np.flatnonzero((doc_freq <= high) & (doc_freq >= low))
+    if len(kept) == 0:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    column = np.full(len(terms), -1, dtype=np.int64)
+    column[kept] = np.arange(len(kept))
+
+    cols = column[indices]
+    keep = cols >= 0
+    row_of = np.repeat(np.arange(n_docs), np.diff(indptr))
+    row_nnz = np.bincount(row_of[keep], minlength=n_docs)
+    counts = sparse.csr_matrix(
+        (data[keep].astype(np.float64), cols[keep], np.concatenate([[0], np.cumsum(row_nnz)])),
+        shape=(n_docs, len(kept)),
+    )
+    counts.sort_indices()
+
+    idf = np.log((1.0 + n_docs) / (1.0 + doc_freq[kept])) + 1.0
+    vectorizer = FrozenTfidfVectorizer(
+        dict(zip(terms[kept].tolist(), range(len(kept)))),
+        idf,
+        ENGLISH_STOP_WORDS if VECTORIZER_PARAMS["stop_words"] == "english" else (),
+    )
+    return vectorizer, _tfidf_weight(counts, idf)
+
+# =========================================================
+# NEIGHBOR TABLE (PRECOMPUTED TOP-K PER JUDUL)
+# =========================================================
+NEIGHBOR_K = 50
+# Batas memori puncak satu blok skor (baris blok x kolom kandidat).
+NEIGHBOR_BLOCK_BYTES = 256 * 1024 * 1024
+# Puncak per sel skor ~3 x float64: hasil sparse hampir dense (data float64 + indeks
+# int32) sebelum `toarray`, lalu blok dense + salinan `-block` + indeks argpartition int64.
+NEIGHBOR_BYTES_PER_SCORE = 8 * 3
+
+def neighbor_block_rows(n_cols: int, block_bytes: int = NEIGHBOR_BLOCK_BYTES) -> int:
+    """Jumlah baris per blok skor agar puncak memori blok [baris, n_cols] <= `block_bytes`."""
+    return max(1, block_bytes // (max(1, n_cols) * NEIGHBOR_BYTES_PER_SCORE))
+
+def _top_k_per_row(block: np.ndarray, k: int):
+    """Posisi kolom & skor k terbesar per baris blok dense, urut menurun."""
+    part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(block, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+def compute_neighbor_table(
+    tfidf_matrix,
+    k: int = NEIGHBOR_K,
+    block_bytes: int = NEIGHBOR_BLOCK_BYTES,
+    rows: Optional[np.ndarray] = None,
+    matrix_t=None,
+):
+    """Top-k tetangga tiap baris (tanpa dirinya sendiri), dihitung per blok baris.
+
+    Mengembalikan (indices int32 [n, k], scores float32 [n, k]) urut skor menurun.
+    Bila `rows` diberikan, hanya baris-baris itu yang dihitung (terhadap seluruh katalog).
+    `matrix_t` (transpose CSR) bisa diberikan agar tidak dihitung ulang tiap panggilan.
+    """
+    n_rows = tfidf_matrix.shape[0]
+    rows = np.arange(n_rows) if rows is None else np.asarray(rows)
+    k = min(k, n_rows - 1)
+    if k <= 0:
+        return np.empty((len(rows), 0), dtype=np.int32), np.empty((len(rows), 0), dtype=np.float32)
+
+    block_rows = neighbor_block_rows(n_rows, block_bytes)
+    nbr_idx = np.empty((len(rows), k), dtype=np.int32)
+    nbr_sim = np.empty((len(rows), k), dtype=np.float32)
+    if matrix_t is None:
+        matrix_t = tfidf_matrix.T.tocsr()
+
+    for start in range(0, len(rows), block_rows):
+        stop = min(start + block_rows, len(rows))
+        block_ids = rows[start:stop]
+        block = (tfidf_matrix[block_ids] @ matrix_t).toarray()
+        block[np.arange(len(block_ids)), block_ids] = -np.inf
+        nbr_idx[start:stop], nbr_sim[start:stop] = _top_k_per_row(block, k)
+
+    return nbr_idx, nbr_sim
+
+# =========================================================
+# ARTIFACT STORE (CACHE DI DISK ANTAR PROSES)
+# =========================================================
+# Naikkan bila format artefak berubah agar artefak lama tidak dipakai.
+ARTIFACT_VERSION = 6
+# Frame ringkas (`compact_frame`); `soup` & `display_title` dibentuk ulang bila perlu.
+PREPARED_COLUMNS = [
+    "show_id", "type", "title", "director", "cast", "country", "release_year",
+    "rating", "duration", "listed_in", "description",
+]
+# Artefak dibuka lewat memory map (read-only) secara default: beberapa proses
+# server di satu host berbagi page cache OS yang sama, bukan salinan per proses.
+ARTIFACT_MMAP = os.environ.get("NETFLIX_ARTIFACT_MMAP", "1") != "0"
+
+def dataset_fingerprint(source: Union[bytes, memoryview, Path]) -> str:
+    """Sidik jari isi dataset + parameter model, dipakai sebagai kunci artefak."""
+    h = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        h.update(source)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    settings = {
+        "artifact_version": ARTIFACT_VERSION,
+        "vectorizer": VECTORIZER_PARAMS,
+        "neighbor_k": NEIGHBOR_K,
+        "matrix_budget_mb": MATRIX_BUDGET_MB,
+    }
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+def _artifact_path(fingerprint: str) -> Path:
+    return ARTIFACT_DIR / f"v{ARTIFACT_VERSION}-{fingerprint[:24]}"
+
+def save_arrays(directory: Path, prefix: str, **arrays) -> None:
+    """Tulis tiap array sebagai `<prefix>_<nama>.npy` datar (bisa di-mmap), atomik per file."""
+    for name, arr in arrays.items():
+        target = Path(directory) / f"{prefix}_{name}.npy"
+        tmp = target.with_name(f".{target.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(arr), allow_pickle=False)
+        tmp.replace(target)
+
+def load_arrays(directory: Path, prefix: str, names, mmap: bool = ARTIFACT_MMAP) -> dict:
+    """Kebalikan `save_arrays`; dengan `mmap` array berupa memmap read-only (tanpa salinan)."""
+    mode = "r" if mmap else None
+    return {name: np.load(Path(directory) / f"{prefix}_{name}.npy", mmap_mode=mode, allow_pickle=False)
+            for name in names}
+
+def save_csr(directory: Path, prefix: str, matrix) -> None:
+    """CSR sebagai data/indices/indptr datar; indeks kolom diurutkan dulu (file dibaca read-only)."""
+    csr = matrix.tocsr()
+    if not csr.has_sorted_indices:
+        csr = csr.sorted_indices()
+    save_arrays(directory, prefix, data=csr.data, indices=csr.indices, indptr=csr.indptr,
+                shape=np.asarray(csr.shape, dtype=np.int64))
+
+def load_csr(directory: Path, prefix: str, mmap: bool = ARTIFACT_MMAP):
+    z = load_arrays(directory, prefix, ("data", "indices", "indptr", "shape"), mmap)
+    matrix = sparse.csr_matrix((z["data"], z["indices"], z["indptr"]), shape=tuple(int(n) for n in z["shape"]),
+                               copy=False)
+    # Sudah diurutkan saat ditulis; set flag agar scipy tidak mencoba mengurutkan buffer read-only.
+    matrix.has_sorted_indices = True
+    return matrix
+
+def _write_frame(df: pd.DataFrame, path: Path) -> None:
+    """Frame sebagai file Arrow IPC tanpa kompresi (kolom teks & numerik bisa di-mmap zero-copy)."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+def _read_frame(path: Path, mmap: bool = ARTIFACT_MMAP) -> pd.DataFrame:
+    import pyarrow as pa
+
+    source = pa.memory_map(str(path), "r") if mmap else pa.OSFile(str(path), "rb")
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks: kolom numerik tidak digabung ke satu blok baru, sehingga tetap menunjuk ke mmap.
+    return table.to_pandas(split_blocks=True)
+
+def save_artifacts(fingerprint: str, df: pd.DataFrame, vectorizer: "TfidfVectorizer", tfidf_matrix,
+                   neighbors=None) -> bool:
+    """Tulis frame siap pakai (Arrow IPC), vocabulary, stop words, idf, CSR (& tabel tetangga) ke disk.
+
+    Array (termasuk vocabulary sebagai bytes terurut) ditulis sebagai file
+    `.npy` datar agar `load_artifacts` bisa membukanya lewat memory map.
+    Tabel tetangga (O(N²)) biasanya ditambahkan belakangan oleh job batch
+    lewat `save_neighbor_table`; tanpa tabel, `recommend_by_index` menskor live.
+    """
+    target = _artifact_path(fingerprint)
+    if target.exists():
+        return True
+    try:
+        ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=ARTIFACT_DIR))
+        try:
+            _write_frame(compact_frame(df[PREPARED_COLUMNS]).reset_index(drop=True), tmp / "prepared.arrow")
+
+            vocab = vectorizer.vocabulary_
+            if not isinstance(vocab, SortedVocabulary):
+                vocab = SortedVocabulary.from_dict(vocab)
+            save_arrays(tmp, "vocab", terms=vocab.terms, ids=vocab.ids)
+            stop_words = sorted(vectorizer.get_stop_words() or ())
+            (tmp / "stop_words.txt").write_text("\n".join(stop_words), encoding="utf-8")
+
+            save_csr(tmp, "tfidf", tfidf_matrix)
+            save_arrays(tmp, "model", idf=vectorizer.idf_)
+            if neighbors is not None:
+                save_arrays(tmp, "neighbors", idx=neighbors[0], sim=neighbors[1])
+            manifest = {
+                "artifact_version": ARTIFACT_VERSION,
+                "fingerprint": fingerprint,
+                "vectorizer": VECTORIZER_PARAMS,
+                "matrix_budget_mb": MATRIX_BUDGET_MB,
+                "rows": int(len(df)),
+                **model_footprint(vectorizer, tfidf_matrix),
+                "created": datetime.now().isoformat(timespec="seconds"),
+            }
+            (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2, default=str), encoding="utf-8")
+            os.replace(tmp, target)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return True
+    except Exception:
+        return False
+
+def load_artifacts(fingerprint: str, mmap: bool = ARTIFACT_MMAP):
+    """Muat (df, vectorizer, tfidf_matrix, neighbors) dari disk; None bila belum ada.
+
+    Vectorizer yang dikembalikan adalah `FrozenTfidfVectorizer` (tanpa scikit-learn).
+    Dengan `mmap`, frame, CSR, idf & tabel tetangga menunjuk langsung ke file
+    (read-only, dibagi antar proses); operasi yang mengubah data membuat salinan.
+    """
+    path = _artifact_path(fingerprint)
+    if not (path / "manifest.json").exists():
+        return None
+    try:
+        manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("artifact_version") != ARTIFACT_VERSION or manifest.get("fingerprint") != fingerprint:
+            return None
+
+        df = _read_frame(path / "prepared.arrow", mmap)
+        vocab = load_arrays(path, "vocab", ("terms", "ids"), mmap)
+        stop_words = (path / "stop_words.txt").read_text(encoding="utf-8").split("\n")
+
+        tfidf_matrix = load_csr(path, "tfidf", mmap)
+        z = load_arrays(path, "model", ("idf",), mmap)
+
+        vocabulary = SortedVocabulary(vocab["terms"], vocab["ids"])
+        vectorizer = FrozenTfidfVectorizer(vocabulary, z["idf"], stop_words)
+        return df, vectorizer, tfidf_matrix, load_neighbor_table(fingerprint, mmap)
+    except Exception:
+        return None
+
+def save_neighbor_table(fingerprint: str, neighbors) -> bool:
+    """Tambahkan tabel tetangga ke artefak dataset yang sudah ada (tahap batch/CLI)."""
+    path = _artifact_path(fingerprint)
+    if not (path / "manifest.json").exists():
+        return False
+    try:
+        # `sim` ditulis terakhir: loader hanya memakai tabel yang sudah lengkap.
+        save_arrays(path, "neighbors", idx=neighbors[0])
+        save_arrays(path, "neighbors", sim=neighbors[1])
+        return True
+    except Exception:
+        return False
+
+def load_neighbor_table(fingerprint: str, mmap: bool = ARTIFACT_MMAP):
+    """(nbr_idx, nbr_sim) dari artefak, atau None bila belum dibangun job batch."""
+    try:
+        z = load_arrays(_artifact_path(fingerprint), "neighbors", ("idx", "sim"), mmap)
+    except Exception:
+        return None
+    return z["idx"], z["sim"]
+
+# =========================================================
+# INCREMENTAL UPDATE (DELTA KATALOG TANPA REFIT)
+# =========================================================
+# Bila porsi baris baru/berubah melebihi rasio ini, vocabulary & idf di-fit ulang penuh.
+FULL_REBUILD_RATIO = 0.2
+
+def _merge_neighbor_rows(tfidf_matrix, neighbors, changed: np.ndarray, block_bytes: int = NEIGHBOR_BLOCK_BYTES):
+    """Perbarui tabel tetangga setelah baris `changed` diganti/ditambah.
+
+    Baris yang berubah dihitung ulang penuh. Baris lain menggabungkan daftar
+    lamanya (tanpa entri ke baris yang berubah) dengan skor baru terhadap
+    `changed`. Entri yang tidak lagi pasti benar (di bawah skor terendah daftar
+    lama, padahal ada entri yang dibuang) ditandai -1 agar
+    `recommend_by_index` jatuh ke scoring live bila membutuhkannya.
+    """
+    old_idx, old_sim = neighbors
+    n_rows = tfidf_matrix.shape[0]
+    k = old_idx.shape[1]
+    nbr_idx = np.full((n_rows, k), -1, dtype=np.int32)
+    nbr_sim = np.full((n_rows, k), -np.inf, dtype=np.float32)
+    nbr_idx[: len(old_idx)] = old_idx
+    nbr_sim[: len(old_sim)] = old_sim
+    if k == 0 or len(changed) == 0:
+        return nbr_idx, nbr_sim
+
+    nbr_idx[changed], nbr_sim[changed] = compute_neighbor_table(tfidf_matrix, k, block_bytes, rows=changed)
+
+    is_changed = np.zeros(n_rows, dtype=bool)
+    is_changed[changed] = True
+    others = np.flatnonzero(~is_changed)
+    changed_t = tfidf_matrix[changed].T.tocsr()
+    block_rows = neighbor_block_rows(k + len(changed), block_bytes)
+
+    for start in range(0, len(others), block_rows):
+        rows = others[start : start + block_rows]
+        cur_idx, cur_sim = nbr_idx[rows], nbr_sim[rows].astype(np.float64)
+        # Skor entri valid terakhir: baris di luar daftar lama pasti tidak melebihinya.
+        n_valid = (cur_idx >= 0).sum(axis=1)
+        floor = np.where(n_valid > 0, cur_sim[np.arange(len(rows)), np.maximum(n_valid - 1, 0)], np.inf)
+        stale = (cur_idx < 0) | is_changed[np.maximum(cur_idx, 0)]
+        cur_sim[stale] = -np.inf
+
+        cand_idx = np.hstack([cur_idx, np.broadcast_to(changed, (len(rows), len(changed)))])
+        cand_sim = np.hstack([cur_sim, (tfidf_matrix[rows] @ changed_t).toarray()])
+        pos, top_sim = _top_k_per_row(cand_sim, k)
+        top_idx = np.take_along_axis(cand_idx, pos, axis=1)
+
+        uncertain = stale.any(axis=1)[:, None] & (top_sim < floor[:, None])
+        top_idx[uncertain | np.isneginf(top_sim)] = -1
+        nbr_idx[rows], nbr_sim[rows] = top_idx, top_sim
+
+    return nbr_idx, nbr_sim
+
+def apply_catalog_delta(df: pd.DataFrame, vectorizer: "TfidfVectorizer", tfidf_matrix, neighbors, delta_raw: pd.DataFrame):
+    """Tambah/ganti baris per `show_id` dari delta tanpa refit seluruh korpus.
+
+    Baris delta di-transform dengan vocabulary & idf yang dibekukan. Bila
+    porsi perubahan melewati `FULL_REBUILD_RATIO`, model di-fit ulang penuh.
+    Mengembalikan (df, vectorizer, tfidf_matrix, neighbors, n_changed); df berupa `compact_frame`.
+    Tabel tetangga diperbarui hanya untuk baris yang berubah; setelah fit ulang
+    penuh tabel dianggap basi (None) sampai job batch membangunnya lagi.
+    """
+    id_cols = [c for c in delta_raw.columns if COLUMN_ALIASES.get(str(c).strip().lower()) == "show_id"]
+    if id_cols:
+        delta_raw = delta_raw.drop_duplicates(subset=id_cols[0], keep="last")
+    delta = prepare_data(delta_raw)
+    if delta.empty:
+        return df, vectorizer, tfidf_matrix, neighbors, 0
+
+    n_base = len(df)
+    pos = pd.Index(df["show_id"].astype(str)).get_indexer(delta["show_id"].astype(str))
+    replaced = pos >= 0
+    n_added = int((~replaced).sum())
+
+    # Urutan baris gabungan: posisi lama dipertahankan, baris baru di belakang.
+    order = np.arange(n_base + n_added)
+    order[pos[replaced]] = n_base + np.flatnonzero(replaced)
+    order[n_base:] = n_base + np.flatnonzero(~replaced)
+    changed = np.concatenate([pos[replaced], np.arange(n_base, n_base + n_added)])
+
+    # Category + object digabung menjadi object; frame hasil diringkas lagi di akhir.
+    merged = pd.concat([df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}),
+                        delta.reindex(columns=df.columns)], ignore_index=True)
+    merged = compact_frame(merged.iloc[order].reset_index(drop=True))
+
+    if len(changed) > FULL_REBUILD_RATIO * len(merged):
+        # Tabel tetangga lama tidak berlaku lagi (None = basi); dibangun ulang oleh job batch.
+        vectorizer, new_matrix = build_vectorizer_and_matrix(build_soup(merged))
+        return merged, vectorizer, new_matrix, None, len(changed)
+
+    delta_matrix = vectorizer.transform(delta["soup"].astype(str).values).astype(tfidf_matrix.dtype)
+    new_matrix = sparse.vstack([tfidf_matrix, delta_matrix], format="csr")[order]
+    new_neighbors = None if neighbors is None else _merge_neighbor_rows(new_matrix, neighbors, changed)
+    return merged, vectorizer, new_matrix, new_neighbors, len(changed)
+
+# =========================================================
+# INVERTED INDEX (POSTINGS PER TERM)
+# =========================================================
+def build_inverted_index(tfidf_matrix):
+    """Salinan CSC dari matriks TF-IDF: kolom = postings (baris, bobot) per term."""
+    return sparse.csc_matrix(tfidf_matrix)
+
+def _postings_scores(q_vec, inverted_index):
+    """Akumulasi skor dot-product hanya untuk dokumen yang memuat term query.
+
+    Mengembalikan (rows, scores) untuk dokumen kandidat, tanpa urutan tertentu.
+    """
+    q_vec = q_vec.tocsr()
+    indptr, indices, data = inverted_index.indptr, inverted_index.indices, inverted_index.data
+    rows = [indices[indptr[t] : indptr[t + 1]] for t in q_vec.indices]
+    weights = [data[indptr[t] : indptr[t + 1]] * w for t, w in zip(q_vec.indices, q_vec.data)]
+    if not rows:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    rows, inverse = np.unique(np.concatenate(rows), return_inverse=True)
+    return rows, np.bincount(inverse, weights=np.concatenate(weights), minlength=len(rows))
+
+# Batas memori skor dense satu potong batch (float64 per sel [b, n]).
+BATCH_SCORE_BYTES = 64 * 1024 * 1024
+
+def batch_scores(q_matrix, inverted_index) -> np.ndarray:
+    """Skor [b, n] untuk b query sekaligus (baris `q_matrix`) dalam satu perkalian.
+
+    Hanya postings term yang muncul di salah satu query yang diambil, sehingga
+    biaya mengikuti jumlah term di batch, bukan ukuran vocabulary. Hasilnya
+    view transpose dari produk [n, b] (tanpa salinan); baris ke-j identik
+    dengan `_linear_scores(q_matrix[j], tfidf_matrix)`. Skor tetap dense:
+    term tipe ("movie", "tv show") ada di hampir setiap dokumen, jadi produk
+    sparse nyaris penuh. Batasi b lewat `batch_slices`.
+    """
+    q = sparse.csc_matrix(q_matrix)
+    terms = np.flatnonzero(np.diff(q.indptr))
+    if len(terms) == 0:
+        return np.zeros((q.shape[0], inverted_index.shape[0]))
+    return np.asarray(inverted_index[:, terms] @ q[:, terms].T.toarray()).T
+
+def batch_slices(n_queries: int, n_rows: int, budget_bytes: int = BATCH_SCORE_BYTES) -> list:
+    """Potongan [start, stop) batch agar skor [b, n] satu potongan muat di `budget_bytes`."""
+    step = max(1, budget_bytes // max(n_rows * 8, 1))
+    return [(s, min(s + step, n_queries)) for s in range(0, n_queries, step)]
+
+# =========================================================
+# METADATA INDEX (FILTER TIPE / RATING / TAHUN)
+# =========================================================
+def _bits_at(bitmap: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Nilai bit `rows` pada bitmap hasil np.packbits (urutan bit big-endian)."""
+    return ((bitmap[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+
+class MetadataIndex:
+    """Indeks kolom metadata, dibangun sekali per versi dataset.
+
+    Bitmap (np.packbits) per nilai `type` dan `rating`, plus permutasi baris
+    terurut `release_year` sehingga rentang tahun cukup dua searchsorted.
+    """
+
+    def __init__(self, n_rows: int, type_bitmaps: dict, rating_bitmaps: dict,
+                 year_order: np.ndarray, years_sorted: np.ndarray):
+        self.n_rows = n_rows
+        self.type_bitmaps = type_bitmaps
+        self.rating_bitmaps = rating_bitmaps
+        self.year_order = year_order
+        self.years_sorted = years_sorted
+
+    @staticmethod
+    def _bitmaps(values: np.ndarray) -> dict:
+        codes, uniques = pd.factorize(values)
+        out = {}
+        for code, value in enumerate(uniques):
+            if value:
+                out[value] = np.packbits(codes == code)
+        return out
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "MetadataIndex":
+        years = df["release_year"].to_numpy()
+        year_order = np.argsort(years, kind="stable").astype(np.int32)
+        return cls(
+            n_rows=len(df),
+            type_bitmaps=cls._bitmaps(df["type"].to_numpy(dtype=object)),
+            rating_bitmaps=cls._bitmaps(df["rating"].to_numpy(dtype=object)),
+            year_order=year_order,
+            years_sorted=years[year_order],
+        )
+
+    def select(
+        self,
+        type_value: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        rating: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """Baris (terurut naik) yang lolos semua filter; None bila tidak ada filter aktif."""
+        rows = None
+        if year_min is not None or year_max is not None:
+            lo = 0 if year_min is None else np.searchsorted(self.years_sorted, year_min, side="left")
+            hi = self.n_rows if year_max is None else np.searchsorted(self.years_sorted, year_max, side="right")
+            if lo > 0 or hi < self.n_rows:
+                rows = np.sort(self.year_order[lo:hi])
+        for bitmaps, value in ((self.type_bitmaps, type_value), (self.rating_bitmaps, rating)):
+            if not value:
+                continue
+            bitmap = bitmaps.get(value)
+            if bitmap is None:
+                return np.empty(0, dtype=np.int32)
+            if rows is None:
+                rows = np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows)).astype(np.int32)
+            else:
+                rows = rows[_bits_at(bitmap, rows)]
+        return rows
+
+    def mask(self, rows: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if rows is None:
+            return None
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return mask
+
+# =========================================================
+# TOP-K ENGINE
+# =========================================================
+# Di bawah rasio ini, baris kandidat di-slice dulu sebelum dihitung skornya;
+# di atasnya lebih murah menghitung semua baris lalu ambil yang lolos filter.
+CANDIDATE_SLICE_RATIO = 0.5
+# Skor lewat postings (CSC) bila total panjang postings term query <= rasio ini x nnz
+# matriks; di atasnya CSR x query dense lebih murah. Di netflix_titles.csv kata kunci
+# ~0.1% nnz (~80x lebih cepat), baris judul ~5% nnz (~3x lebih cepat).
+POSTINGS_SCAN_RATIO = 0.1
+
+def _filter_mask(
+    df: pd.DataFrame,
+    type_value: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    rating: Optional[str] = None,
+) -> Optional[np.ndarray]:
+    """Mask boolean baris yang lolos filter tipe/tahun/rating (None = semua lolos)."""
+    mask = None
+    if type_value:
+        mask = df["type"].to_numpy() == type_value
+    if rating:
+        m = df["rating"].to_numpy() == rating
+        mask = m if mask is None else mask & m
+    if year_min is not None or year_max is not None:
+        years = df["release_year"].to_numpy()
+        if year_min is not None:
+            m = years >= year_min
+            mask = m if mask is None else mask & m
+        if year_max is not None:
+            m = years <= year_max
+            mask = m if mask is None else mask & m
+    return mask
+
+def _filter_rows(
+    df: pd.DataFrame,
+    meta_index: Optional[MetadataIndex],
+    type_value: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    rating: Optional[str] = None,
+):
+    """(rows, mask) kandidat yang lolos filter, sebelum skor dihitung (keduanya None = semua lolos).
+
+    Dengan `meta_index` baris diambil dari bitmap/permutasi tahun; tanpa indeks
+    jatuh ke perbandingan kolom penuh.
+    """
+    if meta_index is not None:
+        rows = meta_index.select(type_value, year_min, year_max, rating)
+        return rows, meta_index.mask(rows)
+    mask = _filter_mask(df, type_value, year_min, year_max, rating)
+    return (None if mask is None else np.flatnonzero(mask)), mask
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Posisi k skor tertinggi (urut menurun) dengan argpartition, tanpa sort penuh."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(len(scores))
+    return part[np.argsort(-scores[part], kind="stable")]
+
+def _postings_dense_scores(q_vec, postings) -> Optional[np.ndarray]:
+    """Skor [n] semua baris lewat postings term query; None bila postings-nya terlalu panjang.
+
+    Biaya mengikuti panjang postings term query (bukan nnz matriks atau
+    lebar vocabulary), jadi query pendek tidak perlu dipadatkan sepanjang V.
+    """
+    q_vec = q_vec.tocsr()
+    indptr = postings.indptr
+    starts, stops = indptr[q_vec.indices], indptr[q_vec.indices + 1]
+    if (stops - starts).sum() > POSTINGS_SCAN_RATIO * postings.nnz:
+        return None
+    if len(starts) == 0:
+        return np.zeros(postings.shape[0])
+    rows = np.concatenate([postings.indices[a:b] for a, b in zip(starts, stops)])
+    weights = np.concatenate([postings.data[a:b] * w for a, b, w in zip(starts, stops, q_vec.data)])
+    return np.bincount(rows, weights=weights, minlength=postings.shape[0])
+
+def _linear_scores(q_vec, matrix, postings=None) -> np.ndarray:
+    """Dot product satu query terhadap setiap baris `matrix` (sparse atau dense), bentuk [n].
+
+    Dengan `postings` (salinan CSC `matrix`) query yang term-nya jarang diskor
+    lewat postings (`_postings_dense_scores`). Selain itu query sparse
+    dipadatkan dulu: CSR x vektor dense ~2x lebih cepat daripada CSR x CSR dan
+    hasilnya identik (urutan penjumlahan per baris sama).
+    """
+    if sparse.issparse(q_vec) and postings is not None:
+        scores = _postings_dense_scores(q_vec, postings)
+        if scores is not None:
+            return scores
+    if sparse.issparse(q_vec) and sparse.issparse(matrix):
+        return np.asarray(matrix @ q_vec.toarray().ravel()).ravel()
+    scores = matrix @ q_vec.T
+    if sparse.issparse(scores):
+        scores = scores.toarray()
+    return np.asarray(scores).ravel()
+
+def _rank_rows(
+    q_vec,
+    df: pd.DataFrame,
+    tfidf_matrix,
+    rows: Optional[np.ndarray],
+    top_n: int,
+    postings=None,
+) -> pd.DataFrame:
+    """Skor hanya `rows` (None = semua baris), pilih top_n, dan materialisasi top_n baris saja.
+
+    `postings` (CSC `tfidf_matrix`, opsional) dipakai saat semua/sebagian besar baris diskor.
+    """
+    n_rows = tfidf_matrix.shape[0]
+    if rows is None:
+        scores = _linear_scores(q_vec, tfidf_matrix, postings)
+    elif len(rows) == 0:
+        return df.iloc[[]].assign(similarity=np.empty(0))
+    elif len(rows) < n_rows * CANDIDATE_SLICE_RATIO:
+        scores = _linear_scores(q_vec, tfidf_matrix[rows])
+    else:
+        scores = _linear_scores(q_vec, tfidf_matrix, postings)[rows]
+
+    top = _top_k(scores, top_n)
+    positions = top if rows is None else rows[top]
+    return _take_rows(df, positions, scores[top])
+
+def _take_rows(df: pd.DataFrame, positions: np.ndarray, scores: np.ndarray) -> pd.DataFrame:
+    """Materialisasi hanya baris hasil, plus kolom similarity."""
+    recs = df.iloc[positions].copy()
+    recs["similarity"] = np.asarray(scores, dtype=np.float64)
+    return recs
+
+def _scoring_space(q_vec, tfidf_matrix, idx: Optional[int] = None, field_scorer=None, inverted_index=None):
+    """(matriks, vektor query, postings) tempat skor dihitung: TF-IDF sparse atau blok field berbobot.
+
+    Mode dense tidak punya ruang skor sendiri: embedding hanya memilih
+    kandidat (`_dense_rows`), skornya tetap TF-IDF.
+    """
+    if field_scorer is not None:
+        q = field_scorer.query_row(idx) if idx is not None else field_scorer.query_vector(q_vec)
+        return field_scorer.matrix, q, field_scorer.postings
+    return tfidf_matrix, q_vec, inverted_index
+
+def _neighbor_rows(neighbors, idx: int, mask: Optional[np.ndarray], top_n: int):
+    """(posisi, skor) top_n dari tabel tetangga yang lolos `mask`; None bila kandidatnya kurang."""
+    nbr_idx, nbr_sim = neighbors[0][idx], neighbors[1][idx]
+    valid = nbr_idx >= 0
+    nbr_idx, nbr_sim = nbr_idx[valid], nbr_sim[valid]
+    if mask is not None:
+        keep = mask[nbr_idx]
+        nbr_idx, nbr_sim = nbr_idx[keep], nbr_sim[keep]
+    if len(nbr_idx) < top_n:
+        return None
+    return nbr_idx[:top_n], nbr_sim[:top_n]
+
+def _ann_rows(ann_index, q_vec, mask: Optional[np.ndarray], exclude: Optional[int] = None) -> np.ndarray:
+    """Kandidat dari indeks ANN yang lolos filter (skor akhirnya tetap dihitung eksak)."""
+    rows = ann_index.candidates(q_vec)
+    if exclude is not None:
+        rows = rows[rows != exclude]
+    if mask is not None:
+        rows = rows[mask[rows]]
+    return rows
+
+def _dense_rows(dense_model, q_dense, rows: Optional[np.ndarray], n_rows: int, exclude=()) -> np.ndarray:
+    """Kandidat dari embedding dense (di dalam `rows`, tanpa `exclude`); skor akhirnya dihitung eksak."""
+    if len(exclude):
+        keep = np.ones(n_rows, dtype=bool) if rows is None else np.zeros(n_rows, dtype=bool)
+        if rows is not None:
+            keep[rows] = True
+        keep[np.asarray(exclude)] = False
+        rows = np.flatnonzero(keep)
+    return dense_model.candidates(q_dense, rows)
+
+def recommend_by_index(
+    idx: int,
+    df: pd.DataFrame,
+    tfidf_matrix,
+    top_n: int = 10,
+    same_type: bool = True,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    neighbors=None,
+    ann_index=None,
+    dense_model=None,
+    meta_index: Optional[MetadataIndex] = None,
+    field_scorer=None,
+    inverted_index=None,
+) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if idx < 0 or idx >= len(df):
+        return pd.DataFrame()
+
+    selected_type = df["type"].iat[idx] if same_type else None
+    rows, mask = _filter_rows(df, meta_index, selected_type, year_min, year_max)
+
+    # Jawab dari tabel tetangga bila cukup kandidat yang lolos filter;
+    # kalau filter membuang terlalu banyak, hitung ulang secara live
+    # (lewat kandidat ANN bila indeksnya diberikan, lalu scan eksak).
+    if neighbors is not None and dense_model is None and field_scorer is None:
+        hit = _neighbor_rows(neighbors, idx, mask, top_n)
+        if hit is not None:
+            return _take_rows(df, *hit)
+
+    q_vec = tfidf_matrix[idx]
+    matrix, score_vec, postings = _scoring_space(q_vec, tfidf_matrix, idx, field_scorer, inverted_index)
+    if dense_model is not None:
+        cand = _dense_rows(dense_model, dense_model.embeddings[idx], rows, len(df), exclude=[idx])
+        return _rank_rows(score_vec, df, matrix, np.sort(cand), top_n)
+    if ann_index is not None:
+        cand = _ann_rows(ann_index, q_vec, mask, exclude=idx)
+        if len(cand) >= top_n:
+            return _rank_rows(score_vec, df, matrix, cand, top_n)
+
+    rows = np.delete(np.arange(len(df)), idx) if rows is None else rows[rows != idx]
+    return _rank_rows(score_vec, df, matrix, rows, top_n, postings)
+
+def recommend_by_query(
+    query: str,
+    df: pd.DataFrame,
+    vectorizer: "TfidfVectorizer",
+    tfidf_matrix,
+    top_n: int = 10,
+    type_filter: str = "All",
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    ann_index=None,
+    dense_model=None,
+    inverted_index=None,
+    meta_index: Optional[MetadataIndex] = None,
+    rating_filter: str = "All",
+    field_scorer=None,
+) -> pd.DataFrame:
+    q = _normalize_text(query)
+    if not q:
+        return pd.DataFrame()
+
+    q_vec = vectorizer.transform([q])
+    if q_vec.nnz == 0:
+        return pd.DataFrame()
+
+    type_value = type_filter if type_filter != "All" else None
+    rating_value = rating_filter if rating_filter != "All" else None
+    rows, mask = _filter_rows(df, meta_index, type_value, year_min, year_max, rating_value)
+
+    # Postings: hanya dokumen yang berbagi minimal satu term query yang diskor.
+    # Bila kandidat kurang dari top_n, scan penuh tetap dipakai (skor 0 ikut terurut).
+    if inverted_index is not None and dense_model is None and field_scorer is None:
+        cand, scores = _postings_scores(q_vec, inverted_index)
+        if mask is not None:
+            keep = mask[cand]
+            cand, scores = cand[keep], scores[keep]
+        if len(cand) >= top_n:
+            top = _top_k(scores, top_n)
+            return _take_rows(df, cand[top], scores[top])
+
+    matrix, score_vec, postings = _scoring_space(q_vec, tfidf_matrix, field_scorer=field_scorer,
+                                                 inverted_index=inverted_index)
+    if dense_model is not None:
+        cand = _dense_rows(dense_model, dense_model.project(q_vec), rows, len(df))
+        return _rank_rows(score_vec, df, matrix, np.sort(cand), top_n)
+    if ann_index is not None:
+        cand = _ann_rows(ann_index, q_vec, mask)
+        if len(cand) >= top_n:
+            return _rank_rows(score_vec, df, matrix, cand, top_n)
+    return _rank_rows(score_vec, df, matrix, rows, top_n, postings)
+
+# Bobot total seed negatif relatif terhadap seed positif (gaya Rocchio).
+NEGATIVE_SEED_WEIGHT = 0.5
+
+def _seed_rows(seeds, n_rows: int) -> np.ndarray:
+    """Posisi seed unik yang valid, urutan pertama kali muncul dipertahankan."""
+    seeds = np.asarray(list(seeds), dtype=np.int64)
+    seeds = seeds[(seeds >= 0) & (seeds < n_rows)]
+    _, first = np.unique(seeds, return_index=True)
+    return seeds[np.sort(first)]
+
+def _profile_vector(rows_matrix, weights: np.ndarray):
+    """Kombinasi linear baris seed (sparse atau dense), bentuk [1, dim]; None bila semuanya nol.
+
+    Tidak dinormalisasi ulang, sehingga skor = rata-rata kemiripan ke seed
+    positif dikurangi penalti seed negatif (satu seed = skor `recommend_by_index`).
+    """
+    if sparse.issparse(rows_matrix):
+        profile = sparse.csr_matrix(weights[None, :]) @ rows_matrix
+        profile.eliminate_zeros()
+        empty = profile.nnz == 0
+    else:
+        profile = (weights @ rows_matrix)[None, :]
+        empty = not np.any(profile)
+    return None if empty else profile
+
+def recommend_by_profile(
+    seeds,
+    df: pd.DataFrame,
+    tfidf_matrix,
+    top_n: int = 10,
+    negative_seeds=(),
+    same_type: bool = True,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    ann_index=None,
+    dense_model=None,
+    meta_index: Optional[MetadataIndex] = None,
+    field_scorer=None,
+    negative_weight: float = NEGATIVE_SEED_WEIGHT,
+    inverted_index=None,
+) -> pd.DataFrame:
+    """Rekomendasi dari beberapa judul sekaligus (profil), dalam satu kali scoring.
+
+    Profil = rata-rata baris seed positif dikurangi `negative_weight` x rata-rata
+    seed negatif; katalog diskor sekali terhadap profil itu (bukan satu scan
+    per seed, karena dot product linear). Semua seed dikeluarkan dari hasil.
+    `same_type` memfilter ke tipe seed positif bila semuanya bertipe sama.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+    n_rows = len(df)
+    positive = _seed_rows(seeds, n_rows)
+    negative = _seed_rows(negative_seeds, n_rows)
+    negative = negative[~np.isin(negative, positive)]
+    if len(positive) == 0:
+        return pd.DataFrame()
+
+    seed_rows = np.concatenate([positive, negative])
+    weights = np.concatenate([
+        np.full(len(positive), 1.0 / len(positive)),
+        np.full(len(negative), -negative_weight / max(len(negative), 1)),
+    ])
+
+    seed_types = pd.unique(df["type"].to_numpy()[positive])
+    selected_type = seed_types[0] if same_type and len(seed_types) == 1 else None
+    rows, mask = _filter_rows(df, meta_index, selected_type, year_min, year_max)
+
+    if field_scorer is not None:
+        matrix, seed_matrix, postings = field_scorer.matrix, field_scorer.query_row(seed_rows), field_scorer.postings
+    else:
+        matrix, seed_matrix, postings = tfidf_matrix, tfidf_matrix[seed_rows], inverted_index
+    score_vec = _profile_vector(seed_matrix, weights)
+    if score_vec is None:
+        return pd.DataFrame()
+
+    if dense_model is not None:
+        q_dense = _profile_vector(np.asarray(dense_model.embeddings[seed_rows]), weights.astype(np.float32))
+        if q_dense is not None:
+            cand = _dense_rows(dense_model, q_dense, rows, n_rows, exclude=seed_rows)
+            return _rank_rows(score_vec, df, matrix, np.sort(cand), top_n)
+
+    if ann_index is not None:
+        q_vec = score_vec if matrix is tfidf_matrix else _profile_vector(tfidf_matrix[seed_rows], weights)
+        if q_vec is not None:
+            cand = _ann_rows(ann_index, q_vec, mask)
+            cand = cand[~np.isin(cand, seed_rows)]
+            if len(cand) >= top_n:
+                return _rank_rows(score_vec, df, matrix, cand, top_n)
+
+    if rows is None:
+        keep = np.ones(n_rows, dtype=bool)
+        keep[seed_rows] = False
+        rows = np.flatnonzero(keep)
+    else:
+        rows = rows[~np.isin(rows, seed_rows)]
+    return _rank_rows(score_vec, df, matrix, rows, top_n, postings)
+
+def _split_tokens(series: pd.Series, sep: str = ",") -> pd.Series:
+    """Nilai multi-item (dipisah `sep`) di-explode jadi satu token per baris, tanpa token kosong."""
+    s = series.fillna("").astype(str).replace({"unknown": "", "Unknown": "", "nan": "", "NaN": ""})
+    exploded = s.str.split(sep).explode().astype(str).str.strip()
+    return exploded[exploded != ""]
+
+def _count_tokens(tokens: np.ndarray) -> pd.Series:
+    """Sama dengan `value_counts()` (urut frekuensi, seri = urutan kemunculan) via factorize + bincount."""
+    codes, uniques = pd.factorize(tokens)
+    counts = np.bincount(codes, minlength=len(uniques))
+    order = np.argsort(-counts, kind="stable")
+    return pd.Series(counts[order], index=pd.Index(np.asarray(uniques)[order], dtype=object), name="count")
+
+def split_and_count(series: pd.Series, sep: str = ",", top_k: int = 10) -> pd.Series:
+    return _count_tokens(_split_tokens(series, sep).to_numpy(dtype=object)).head(top_k)
+
+# Kolom multi-item yang facet-nya dihitung di `build_facets`.
+FACET_LIST_COLUMNS = ("listed_in", "country")
+
+def build_facets(df: pd.DataFrame, sep: str = ",") -> dict:
+    """Semua agregat dashboard untuk satu versi dataset, dihitung sekali.
+
+    Kolom multi-item di-split/explode dalam satu pass (digabung lalu dipotong
+    per kolom), lalu dihitung lewat factorize + bincount. Tabel hitungan
+    lengkap & terurut; pemakai cukup `.head(k)`.
+    """
+    # Kolom category juga menghitung kategori yang tidak terpakai (0); dibuang.
+    types = df["type"].value_counts()
+    facets = {"stats": create_dashboard_stats(df), "type": types[types > 0]}
+    years = df["release_year"]
+    facets["release_year"] = years[years > 0].value_counts().sort_index()
+
+    tokens = _split_tokens(pd.concat({c: df[c] for c in FACET_LIST_COLUMNS}), sep)
+    column = tokens.index.get_level_values(0).to_numpy()
+    values = tokens.to_numpy(dtype=object)
+    for c in FACET_LIST_COLUMNS:
+        facets[c] = _count_tokens(values[column == c])
+    return facets
+
+def create_dashboard_stats(df: pd.DataFrame) -> dict:
+    stats = {}
+    stats["total"] = len(df)
+    stats["movies"] = int((df["type"] == "Movie").sum())
+    stats["tv_shows"] = int((df["type"] == "TV Show").sum())
+    valid_years = df["release_year"][df["release_year"] > 0]
+    if len(valid_years) > 0:
+        stats["min_year"] = int(valid_years.min())
+        stats["max_year"] = int(valid_years.max())
+        stats["avg_year"] = int(valid_years.mean())
+    else:
+        stats["min_year"] = 1900
+        stats["max_year"] = datetime.now().year
+        stats["avg_year"] = 2000
+    return stats
@@ -0,0 +1,221 @@
+"""Mode embedding dense berdimensi rendah (TruncatedSVD, float32, ter-normalisasi L2).
+
+Embedding dense dipakai sebagai penyaring kandidat: `n_candidates` judul
+dengan skor embedding tertinggi diambil, lalu diskor ulang eksak dengan
+TF-IDF sparse (seperti jalur ANN). Hasil akhirnya tetap skor TF-IDF.
+
+- Proyeksi SVD memakai `DENSE_MAX_FEATURES` kolom dengan massa TF-IDF
+  terbesar (jumlah bobot per kolom), bukan document frequency, agar term
+  yang membedakan judul (nama cast/director) tidak dibuang.
+- Dimensi dipilih per katalog (`dense_dim`) sehingga embedding tidak lebih
+  dari `DENSE_EMBEDDING_RATIO` x byte matriks CSR yang sama.
+- `n_candidates` dikalibrasi saat fit pada sampel judul: nilai terkecil
+  dengan recall@k terhadap scan eksak >= `DENSE_RECALL_TARGET`. Bila target
+  baru tercapai di atas `DENSE_MAX_CANDIDATE_RATIO` x katalog, model ditandai
+  tidak layak (`usable` False) dan app tidak memakainya.
+
+Proyeksi disimpan di samping artefak vectorizer (`dense_*.npy`, bisa di-mmap).
+"""
+from typing import Optional
+
+import numpy as np
+
+from netflix_recommender.core import (
+    ARTIFACT_MMAP,
+    _artifact_path,
+    _top_k,
+    compute_neighbor_table,
+    load_arrays,
+    save_arrays,
+)
+
+# Batas atas dimensi; dipersempit per katalog oleh `dense_dim`.
+DENSE_DIM = 128
+# Embedding float32 per judul paling banyak rasio ini x byte CSR per judul.
+DENSE_EMBEDDING_RATIO = 0.5
+DENSE_MIN_DIM = 16
+# Batas baris proyeksi: 8k fitur x 128 dim x float32 = 4 MB, berapa pun ukuran vocabulary.
+DENSE_MAX_FEATURES = 8_192
+# Kalibrasi jumlah kandidat (recall@k terhadap scan eksak pada sampel judul).
+DENSE_RECALL_TARGET = 0.9
+DENSE_RECALL_K = 10
+DENSE_CALIBRATION_ROWS = 200
+DENSE_MAX_CANDIDATE_RATIO = 0.25
+DENSE_MIN_CANDIDATES = 50
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+def select_features(tfidf_matrix, max_features: int = DENSE_MAX_FEATURES) -> np.ndarray:
+    """Kolom (terurut) dengan massa TF-IDF (jumlah bobot kolom) terbesar, paling banyak `max_features`."""
+    mass = np.bincount(tfidf_matrix.indices, weights=tfidf_matrix.data, minlength=tfidf_matrix.shape[1])
+    if len(mass) <= max_features:
+        return np.arange(len(mass), dtype=np.int32)
+    return np.sort(np.argsort(-mass, kind="stable")[:max_features]).astype(np.int32)
+
+def dense_dim(tfidf_matrix, max_dim: int = DENSE_DIM, ratio: float = DENSE_EMBEDDING_RATIO) -> int:
+    """Dimensi (kelipatan 8) agar embedding float32 <= `ratio` x byte CSR per judul."""
+    csr = tfidf_matrix.tocsr()
+    row_bytes = (csr.data.nbytes + csr.indices.nbytes + csr.indptr.nbytes) / max(csr.shape[0], 1)
+    dim = int(row_bytes * ratio / 4) // 8 * 8
+    return max(DENSE_MIN_DIM, min(max_dim, dim))
+
+def calibrate_candidates(
+    tfidf_matrix,
+    embeddings: np.ndarray,
+    target: float = DENSE_RECALL_TARGET,
+    k: int = DENSE_RECALL_K,
+    n_sample: int = DENSE_CALIBRATION_ROWS,
+    max_ratio: float = DENSE_MAX_CANDIDATE_RATIO,
+    random_state: int = 0,
+) -> tuple:
+    """(n_candidates, recall@k) dari sampel judul: kandidat terkecil yang mencapai `target`.
+
+    Untuk tiap judul sampel dihitung peringkat dense dari k tetangga eksaknya;
+    recall dengan n kandidat = porsi tetangga eksak berperingkat < n. Bila
+    target butuh lebih dari `max_ratio` x katalog, dikembalikan batas itu
+    beserta recall-nya (di bawah target).
+    """
+    n_rows = tfidf_matrix.shape[0]
+    cap = max(1, int(max_ratio * n_rows))
+    if n_rows <= DENSE_MIN_CANDIDATES + 1:
+        return n_rows, 1.0
+    rng = np.random.default_rng(random_state)
+    sample = np.sort(rng.choice(n_rows, size=min(n_sample, n_rows), replace=False))
+    exact_idx, _ = compute_neighbor_table(tfidf_matrix, k=k, rows=sample)
+
+    ranks = []
+    for i, row in enumerate(sample):
+        scores = embeddings @ embeddings[row]
+        scores[row] = -np.inf
+        found = exact_idx[i][exact_idx[i] >= 0]
+        ranks.append((scores[None, :] > scores[found][:, None]).sum(axis=1))
+    ranks = np.sort(np.concatenate(ranks))
+    need = int(ranks[min(len(ranks) - 1, int(np.ceil(target * len(ranks))) - 1)]) + 1
+    n_candidates = min(max(need, DENSE_MIN_CANDIDATES), cap)
+    return n_candidates, float(np.mean(ranks < n_candidates))
+
+def project_query(components_t: np.ndarray, q_vec, features: Optional[np.ndarray] = None) -> np.ndarray:
+    """Proyeksi vektor TF-IDF (sparse, 1 baris) ke ruang SVD ter-normalisasi, bentuk [dim].
+
+    `features` = kolom TF-IDF untuk tiap baris `components_t` (None = semua kolom).
+    """
+    q_vec = q_vec.tocsr()
+    data, rows = q_vec.data, q_vec.indices
+    if features is not None:
+        pos = np.minimum(np.searchsorted(features, rows), len(features) - 1)
+        hit = features[pos] == rows
+        data, rows = data[hit], pos[hit]
+    q = data.astype(np.float32) @ components_t[rows]
+    return q / max(float(np.linalg.norm(q)), 1e-12)
+
+class DenseModel:
+    """Proyeksi SVD (`components_t` [n_fitur_terpilih, dim]) + embedding katalog [n, dim].
+
+    `features` = kolom TF-IDF yang diproyeksikan (terurut), lihat `select_features`;
+    `n_candidates` & `recall` hasil `calibrate_candidates`.
+    """
+
+    def __init__(self, components_t: np.ndarray, embeddings: np.ndarray, features: np.ndarray,
+                 n_candidates: Optional[int] = None, recall: float = float("nan")):
+        self.components_t = components_t
+        self.embeddings = embeddings
+        self.features = features
+        self.n_candidates = len(embeddings) if n_candidates is None else int(n_candidates)
+        self.recall = float(recall)
+
+    @classmethod
+    def fit(cls, tfidf_matrix, dim: Optional[int] = None, random_state: int = 0,
+            max_features: int = DENSE_MAX_FEATURES, calibrate: bool = True) -> "DenseModel":
+        """`dim` None = `dense_dim(tfidf_matrix)`; `calibrate` False untuk pemakai yang hanya butuh embedding (IVF)."""
+        from sklearn.decomposition import TruncatedSVD
+
+        features = select_features(tfidf_matrix, max_features)
+        matrix = tfidf_matrix.tocsc()[:, features] if len(features) < tfidf_matrix.shape[1] else tfidf_matrix
+        n_rows, n_features = matrix.shape
+        dim = dense_dim(tfidf_matrix) if dim is None else dim
+        dim = max(1, min(dim, n_features - 1, n_rows - 1))
+        svd = TruncatedSVD(n_components=dim, n_iter=2, random_state=random_state)
+        embeddings = np.ascontiguousarray(_l2_normalize(svd.fit_transform(matrix).astype(np.float32)))
+        n_candidates, recall = (
+            calibrate_candidates(tfidf_matrix, embeddings, random_state=random_state) if calibrate
+            else (None, float("nan"))
+        )
+        return cls(
+            components_t=np.ascontiguousarray(svd.components_.T, dtype=np.float32),
+            embeddings=embeddings,
+            features=features,
+            n_candidates=n_candidates,
+            recall=recall,
+        )
+
+    @property
+    def dim(self) -> int:
+        return self.components_t.shape[1]
+
+    @property
+    def usable(self) -> bool:
+        """True bila kalibrasi mencapai `DENSE_RECALL_TARGET` dalam batas kandidat."""
+        return self.recall >= DENSE_RECALL_TARGET
+
+    def project(self, q_vec) -> np.ndarray:
+        """Vektor query dense bentuk [1, dim], siap dipakai sebagai pengganti baris TF-IDF."""
+        return project_query(self.components_t, q_vec, self.features)[None, :]
+
+    def candidates(self, q_dense: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """`n_candidates` posisi (di dalam `rows`, None = semua) dengan skor embedding tertinggi."""
+        q = np.asarray(q_dense, dtype=np.float32).ravel()
+        if rows is None:
+            return _top_k(self.embeddings @ q, self.n_candidates)
+        return rows[_top_k(self.embeddings[rows] @ q, self.n_candidates)]
+
+    @property
+    def nbytes(self) -> int:
+        return self.components_t.nbytes + self.embeddings.nbytes + self.features.nbytes
+
+    def footprint(self) -> dict:
+        """Byte proyeksi (tetap, dibatasi `DENSE_MAX_FEATURES`) & embedding (per judul), plus kalibrasi."""
+        return {
+            "features": int(len(self.features)),
+            "dim": self.dim,
+            "projection_bytes": int(self.components_t.nbytes + self.features.nbytes),
+            "embedding_bytes": int(self.embeddings.nbytes),
+            "n_candidates": self.n_candidates,
+            "recall": self.recall,
+        }
+
+def _dense_params() -> np.ndarray:
+    # Konstanta yang menentukan isi artefak; artefak dengan nilai lain di-fit ulang.
+    return np.asarray([DENSE_DIM, DENSE_EMBEDDING_RATIO, DENSE_MAX_FEATURES, DENSE_RECALL_TARGET,
+                       DENSE_RECALL_K, DENSE_MAX_CANDIDATE_RATIO], dtype=np.float64)
+
+def save_dense_model(fingerprint: str, model: DenseModel) -> bool:
+    """Simpan proyeksi & embedding ke direktori artefak dataset (harus sudah ada)."""
+    path = _artifact_path(fingerprint)
+    if not (path / "manifest.json").exists():
+        return False
+    try:
+        # Metadata ditulis terakhir: loader hanya memakai model yang sudah lengkap.
+        save_arrays(path, "dense", components_t=model.components_t, embeddings=model.embeddings)
+        save_arrays(path, "dense", features=model.features,
+                    calibration=np.asarray([model.n_candidates, model.recall], dtype=np.float64),
+                    params=_dense_params())
+        return True
+    except Exception:
+        return False
+
+def load_dense_model(fingerprint: str, mmap: bool = ARTIFACT_MMAP) -> Optional[DenseModel]:
+    path = _artifact_path(fingerprint)
+    try:
+        z = load_arrays(path, "dense", ("components_t", "embeddings", "features", "calibration", "params"), mmap)
+        n_candidates, recall = np.asarray(z["calibration"], dtype=np.float64)
+        model = DenseModel(z["components_t"], z["embeddings"], z["features"], int(n_candidates), recall)
+    except Exception:
+        return None
+    # Artefak dengan konstanta lain (mis. DENSE_DIM diubah) tidak dipakai.
+    if not np.array_equal(np.asarray(z["params"]), _dense_params()):
+        return None
+    if len(model.features) != model.components_t.shape[0]:
+        return None
+    return model
@@ -0,0 +1,148 @@
+"""TF-IDF per field: satu blok sparse per kolom, bobot field dipilih saat scoring.
+
+`soup` meleburkan semua kolom jadi satu dokumen, sehingga bobot relatif
+"sutradara sama" vs "deskripsi mirip" terkunci saat fit. Di sini tiap field
+di-transform terpisah dengan vocabulary & idf model `soup` (tanpa fit baru),
+dinormalisasi L2 per field, lalu blok-bloknya disusun berdampingan:
+
+    blok = [X_judul | X_sutradara | ... | X_deskripsi]      (n x F*V, CSR)
+    skor = sum_f w_f * cos_f(query, dokumen) / sum_f w_f
+
+Bobot hanya mengalikan nilai vektor query (nnz query, bukan nnz katalog), jadi
+mengubah bobot = satu perkalian sparse biasa, tanpa refit maupun rebuild blok.
+Blok disimpan di samping artefak vectorizer (`fields_*.npy`, bisa di-mmap).
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from netflix_recommender.core import (
+    ARTIFACT_MMAP,
+    _artifact_path,
+    _normalize_series,
+    build_inverted_index,
+    compact_csr,
+    load_arrays,
+    load_csr,
+    save_arrays,
+    save_csr,
+)
+
+# Nama field -> kolom frame siap pakai yang membentuknya (urutan = urutan blok).
+FIELD_BLOCKS = {
+    "title": ("title",),
+    "director": ("director",),
+    "cast": ("cast",),
+    "country": ("country",),
+    "genre": ("listed_in",),
+    "type_rating": ("type", "rating"),
+    "description": ("description",),
+}
+DEFAULT_FIELD_WEIGHTS = {name: 1.0 for name in FIELD_BLOCKS}
+
+def field_texts(df: pd.DataFrame, columns: tuple) -> np.ndarray:
+    """Teks satu field per baris, dinormalisasi sama seperti penyusunan `soup`."""
+    text = _normalize_series(df[columns[0]])
+    for c in columns[1:]:
+        text = text + " " + _normalize_series(df[c])
+    return text.str.strip().to_numpy(dtype=object)
+
+class FieldModel:
+    """Blok TF-IDF per field berdampingan (`matrix` [n, F * n_features]) dalam ruang vocabulary `soup`."""
+
+    def __init__(self, matrix, fields: tuple, n_features: int):
+        self.matrix = matrix
+        self.fields = tuple(fields)
+        self.n_features = int(n_features)
+        self._postings = None
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, vectorizer) -> "FieldModel":
+        """Transform tiap field dengan vectorizer `soup` yang sudah di-fit (tanpa fit ulang)."""
+        n_features = len(vectorizer.vocabulary_)
+        blocks = [vectorizer.transform(field_texts(df, cols)) for cols in FIELD_BLOCKS.values()]
+        matrix = compact_csr(sparse.hstack(blocks, format="csr"))
+        matrix.sort_indices()
+        return cls(matrix, tuple(FIELD_BLOCKS), n_features)
+
+    def weight_vector(self, weights: Optional[dict] = None) -> np.ndarray:
+        """Bobot per blok (urutan `fields`), dinormalisasi agar berjumlah 1; bobot tak disebut = 1."""
+        weights = weights or {}
+        w = np.array([max(float(weights.get(f, 1.0)), 0.0) for f in self.fields])
+        total = w.sum()
+        if total <= 0:
+            raise ValueError("Minimal satu bobot field harus lebih dari 0.")
+        return w / total
+
+    def weighted(self, weights: Optional[dict] = None) -> "WeightedFields":
+        return WeightedFields(self, self.weight_vector(weights))
+
+    @property
+    def postings(self):
+        """Salinan CSC blok (postings per term per field), dibangun saat pertama dipakai.
+
+        Query field hanya mengisi sedikit kolom dari F*V, jadi skornya dihitung
+        lewat postings, bukan dengan memadatkan query sepanjang F*V.
+        """
+        if self._postings is None:
+            self._postings = build_inverted_index(self.matrix)
+        return self._postings
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes
+
+class WeightedFields:
+    """Ruang skor `FieldModel` dengan satu set bobot; dipakai `recommend_by_*` lewat `field_scorer`."""
+
+    def __init__(self, model: FieldModel, block_weights: np.ndarray):
+        self.model = model
+        self.block_weights = block_weights
+        self.matrix = model.matrix
+
+    @property
+    def postings(self):
+        return self.model.postings
+
+    def query_row(self, idx):
+        """Baris katalog `idx` (posisi/array posisi) sebagai query: field dibandingkan dengan field yang sama."""
+        q = self.matrix[idx]
+        q.data = q.data * self.block_weights[q.indices // self.model.n_features]
+        return q
+
+    def query_vector(self, q_vec):
+        """Vektor query `soup` (1 x n_features) diulang ke tiap blok yang bobotnya > 0."""
+        q_vec = q_vec.tocsr()
+        n_features = self.model.n_features
+        active = np.flatnonzero(self.block_weights > 0)
+        indices = (q_vec.indices[None, :] + (active * n_features)[:, None]).ravel()
+        data = (q_vec.data[None, :] * self.block_weights[active][:, None]).ravel()
+        return sparse.csr_matrix(
+            (data, indices, np.array([0, len(indices)])), shape=(1, self.matrix.shape[1])
+        )
+
+def save_field_model(fingerprint: str, model: FieldModel) -> bool:
+    """Simpan blok field ke direktori artefak dataset (harus sudah ada)."""
+    path = _artifact_path(fingerprint)
+    if not (path / "manifest.json").exists():
+        return False
+    try:
+        # Metadata ditulis terakhir: loader hanya memakai blok yang sudah lengkap.
+        save_csr(path, "fields", model.matrix)
+        save_arrays(path, "fields", names=np.asarray(model.fields), n_features=np.asarray(model.n_features))
+        return True
+    except Exception:
+        return False
+
+def load_field_model(fingerprint: str, mmap: bool = ARTIFACT_MMAP) -> Optional[FieldModel]:
+    path = _artifact_path(fingerprint)
+    try:
+        meta = load_arrays(path, "fields", ("names", "n_features"), mmap=False)
+        matrix = load_csr(path, "fields", mmap)
+        model = FieldModel(matrix, tuple(meta["names"].tolist()), int(meta["n_features"]))
+    except Exception:
+        return None
+    # Artefak dengan susunan field lain (mis. FIELD_BLOCKS diubah) tidak dipakai.
+    return model if model.fields == tuple(FIELD_BLOCKS) else None
@@ -0,0 +1,171 @@
+"""Load test untuk `netflix_recommender.server`: klien konkuren dengan koneksi keep-alive.
+
+Setiap klien mengirim request berurutan lewat satu koneksi; `--concurrency`
+klien berjalan bersamaan sampai `--requests` total terkirim. Hasil: throughput,
+latensi p50/p95/p99, jumlah error, dan ukuran batch rata-rata di server
+(dibaca dari `/metrics` sebelum & sesudah run).
+
+    python -m netflix_recommender.server --port 8765 &
+    python -m netflix_recommender.loadtest --url http://127.0.0.1:8765 --concurrency 32 --requests 2000
+    python -m netflix_recommender.loadtest --endpoint index --out loadtest.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+from netflix_recommender.bench import BENCH_QUERIES
+
+ENDPOINTS = ("query", "index", "mixed")
+TYPE_FILTERS = ["All", "All", "Movie", "TV Show"]
+
+class HttpClient:
+    """Klien HTTP/1.1 minimal di atas satu koneksi keep-alive."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, path: str) -> tuple:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1"))
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, await self.reader.readexactly(length)
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+def make_paths(endpoint: str, n: int, n_rows: int, seed: int = 0) -> list:
+    """Daftar path request acak (deterministik per seed)."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(n):
+        kind = endpoint if endpoint != "mixed" else ("query", "index")[i % 2]
+        if kind == "query":
+            params = {"q": BENCH_QUERIES[rng.integers(len(BENCH_QUERIES))], "top_n": 10,
+                      "type": TYPE_FILTERS[rng.integers(len(TYPE_FILTERS))]}
+            paths.append(f"/recommend/query?{urlencode(params)}")
+        else:
+            params = {"index": int(rng.integers(n_rows)), "top_n": 10, "same_type": "true"}
+            paths.append(f"/recommend/index?{urlencode(params)}")
+    return paths
+
+def _batch_counters(text: str) -> tuple:
+    batches = queries = 0.0
+    for line in text.splitlines():
+        if line.startswith("netflix_recommender_score_batches_total"):
+            batches = float(line.split()[-1])
+        elif line.startswith("netflix_recommender_score_batch_queries_total"):
+            queries = float(line.split()[-1])
+    return batches, queries
+
+async def run_load(host: str, port: int, paths: list, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    pending = iter(paths)
+
+    async def client() -> None:
+        nonlocal errors
+        http = HttpClient(host, port)
+        try:
+            for path in pending:
+                t0 = time.perf_counter()
+                try:
+                    status, _ = await http.request(path)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    status = None
+                    await http.close()
+                latencies.append(time.perf_counter() - t0)
+                if status != 200:
+                    errors += 1
+        finally:
+            await http.close()
+
+    probe = HttpClient(host, port)
+    before = _batch_counters((await probe.request("/metrics"))[1].decode("utf-8"))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    after = _batch_counters((await probe.request("/metrics"))[1].decode("utf-8"))
+    await probe.close()
+
+    lat = np.asarray(latencies) * 1000
+    batches, queries = after[0] - before[0], after[1] - before[1]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else float("nan"),
+        "latency_ms": {
+            "p50": float(np.percentile(lat, 50)),
+            "p95": float(np.percentile(lat, 95)),
+            "p99": float(np.percentile(lat, 99)),
+            "mean": float(lat.mean()),
+        },
+        "server_batches": int(batches),
+        "mean_batch_size": queries / batches if batches else None,
+    }
+
+async def _main(args) -> dict:
+    url = urlsplit(args.url)
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+    probe = HttpClient(host, port)
+    status, body = await probe.request("/health")
+    await probe.close()
+    if status != 200:
+        raise SystemExit(f"/health mengembalikan status {status}")
+    health = json.loads(body)
+
+    if args.warmup:
+        await run_load(host, port, make_paths(args.endpoint, args.warmup, health["rows"], args.seed + 1),
+                       args.concurrency)
+    paths = make_paths(args.endpoint, args.requests, health["rows"], args.seed)
+    result = await run_load(host, port, paths, args.concurrency)
+    return {"url": args.url, "endpoint": args.endpoint, "server": health, **result}
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test HTTP API rekomendasi.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="query")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100, help="request pemanasan (tidak diukur)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="simpan hasil sebagai JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(_main(args))
+    lat = result["latency_ms"]
+    batch = f", batch rata-rata {result['mean_batch_size']:.1f}" if result["mean_batch_size"] else ""
+    print(
+        f"{result['requests']:,} request ({result['errors']} error) dalam {result['seconds']:.2f}s: "
+        f"{result['throughput_rps']:.0f} req/s, p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, "
+        f"p99 {lat['p99']:.1f} ms{batch}",
+        file=sys.stderr,
+    )
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
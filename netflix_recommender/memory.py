@@ -0,0 +1,81 @@
+"""Laporan memori frame katalog per kolom: hasil `prepare_data` vs `compact_frame`.
+
+Byte dihitung dengan `memory_usage(deep=True)`, jadi isi string Python ikut
+terhitung (bagian terbesar untuk kolom object). Frame ringkas adalah frame
+yang disajikan setelah fit dan yang ditulis ke artefak.
+
+    python -m netflix_recommender.memory --report reports/frame_memory.md
+    python -m netflix_recommender.memory --rows 100000 --report reports/frame_memory_100k.md
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from netflix_recommender.bench import synthetic_catalog_path
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    _file_format,
+    compact_frame,
+    frame_memory,
+    prepare_data,
+    read_catalog,
+)
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Per kolom: dtype & byte frame `prepare_data` dan `compact_frame` (kolom yang dibuang = 0 byte)."""
+    before, after = frame_memory(df), frame_memory(compact_frame(df))
+    report = before.join(after, lsuffix="_prepared", rsuffix="_compact", how="left")
+    report["dtype_compact"] = report["dtype_compact"].fillna("(dibuang)")
+    report[["bytes_compact", "bytes_per_row_compact"]] = report[["bytes_compact", "bytes_per_row_compact"]].fillna(0)
+    report["saved"] = 1 - report["bytes_compact"] / report["bytes_prepared"].where(report["bytes_prepared"] > 0)
+    return report
+
+def _mb(n_bytes: float) -> str:
+    return f"{n_bytes / 2**20:.2f}"
+
+def _report_markdown(data_name: str, n_rows: int, report: pd.DataFrame) -> str:
+    total = report.loc["total"]
+    lines = [
+        "# Memori frame katalog per kolom",
+        "",
+        f"- Dataset: `{data_name}` — {n_rows:,} judul",
+        f"- Total: {_mb(total['bytes_prepared'])} MB (`prepare_data`) -> {_mb(total['bytes_compact'])} MB "
+        f"(`compact_frame`), hemat {total['saved']:.0%}",
+        f"- Dibuat: {datetime.now().isoformat(timespec='seconds')}",
+        "",
+        "| kolom | dtype prepare | MB | byte/baris | dtype ringkas | MB | byte/baris | hemat |",
+        "|---|---|---:|---:|---|---:|---:|---:|",
+    ]
+    for name, r in report.iterrows():
+        label = f"**{name}**" if name == "total" else f"`{name}`"
+        saved = "" if pd.isna(r["saved"]) else f"{r['saved']:.0%}"
+        lines.append(
+            f"| {label} | {r['dtype_prepared']} | {_mb(r['bytes_prepared'])} | {r['bytes_per_row_prepared']:.1f} "
+            f"| {r['dtype_compact']} | {_mb(r['bytes_compact'])} | {r['bytes_per_row_compact']:.1f} | {saved} |"
+        )
+    return "\n".join(lines) + "\n"
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Laporan memori frame katalog per kolom.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH)
+    parser.add_argument("--rows", type=int, help="pakai katalog sintetis sebanyak ini (lihat bench)")
+    parser.add_argument("--report", type=Path, required=True, help="file output Markdown")
+    args = parser.parse_args(argv)
+
+    path = synthetic_catalog_path(args.rows) if args.rows else args.data
+    df = prepare_data(read_catalog(str(path), _file_format(str(path))))
+    if df.empty:
+        print(f"Dataset kosong / tidak valid: {path}", file=sys.stderr)
+        return 1
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(_report_markdown(path.name, len(df), memory_report(df)), encoding="utf-8")
+    print(f"Laporan ditulis ke {args.report}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
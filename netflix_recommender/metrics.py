@@ -0,0 +1,202 @@
+"""Instrumentasi ringan per tahap: histogram latensi, counter, ekspor Prometheus.
+
+Registry bersifat per proses dan thread-safe (sesi Streamlit berjalan di
+thread berbeda). Tiap proses menulis filenya sendiri (`metrics-<pid>.prom`,
+dengan label `pid`) sehingga beberapa proses tidak saling menimpa; file
+proses yang sudah mati dibersihkan saat proses baru pertama kali menulis.
+Pemakaian:
+
+    with REGISTRY.timed("prepare_data"):
+        df = prepare_data(raw)
+    with REGISTRY.timed("recommend_by_query", mode="exact/tfidf"):
+        ...
+    REGISTRY.write_prometheus()  # -> metrics_path()
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from netflix_recommender.core import ARTIFACT_DIR
+
+METRICS_PREFIX = "netflix_recommender"
+# Batas atas bucket histogram (detik); +Inf ditambahkan saat ekspor.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_DIR = Path(os.environ.get("NETFLIX_METRICS_DIR", ARTIFACT_DIR))
+METRICS_GLOB = "metrics-*.prom"
+
+def metrics_path(pid: Optional[int] = None) -> Path:
+    """File metrik proses `pid` (default proses ini) di `METRICS_DIR`."""
+    return METRICS_DIR / f"metrics-{pid or os.getpid()}.prom"
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+def prune_metrics_files(directory: Path = METRICS_DIR) -> int:
+    """Hapus `metrics-<pid>.prom` milik proses yang sudah tidak berjalan; kembalikan jumlahnya."""
+    removed = 0
+    for path in Path(directory).glob(METRICS_GLOB):
+        pid = path.stem.split("-", 1)[1]
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = np.zeros(len(LATENCY_BUCKETS) + 1, dtype=np.int64)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.n += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimasi kuantil = batas atas bucket tempat kuantil jatuh (inf bila di atas bucket terbesar)."""
+        if self.n == 0:
+            return float("nan")
+        pos = int(np.searchsorted(np.cumsum(self.counts), q * self.n, side="left"))
+        return LATENCY_BUCKETS[pos] if pos < len(LATENCY_BUCKETS) else float("inf")
+
+class MetricsRegistry:
+    """Histogram durasi per (stage, label) + counter bebas; diekspor ke format teks Prometheus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict = {}
+        self._counters: dict = {}
+        self._pruned_pid: Optional[int] = None
+
+    @staticmethod
+    def _key(stage: str, labels: dict) -> tuple:
+        return (("stage", stage),) + tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, stage: str, seconds: float, **labels) -> None:
+        key = self._key(stage, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_total(self, name: str, value: float, **labels) -> None:
+        """Salin counter monoton yang dihitung di tempat lain (mis. statistik cache hasil)."""
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._counters[key] = value
+
+    @contextmanager
+    def timed(self, stage: str, **labels):
+        """Ukur durasi blok; blok yang melempar exception juga menaikkan `stage_errors_total`."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc("stage_errors_total", stage=stage, **labels)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - t0, **labels)
+
+    def snapshot(self) -> list:
+        """Ringkasan per histogram untuk panel diagnostik (durasi dalam milidetik)."""
+        with self._lock:
+            items = [(dict(k), h.n, h.total, h.quantile(0.5), h.quantile(0.95))
+                     for k, h in self._histograms.items()]
+        rows = []
+        for labels, n, total, p50, p95 in sorted(items, key=lambda x: (x[0]["stage"], str(x[0]))):
+            stage = labels.pop("stage")
+            rows.append({
+                "stage": stage,
+                "labels": ", ".join(f"{k}={v}" for k, v in labels.items()),
+                "count": n,
+                "mean_ms": total / n * 1000 if n else float("nan"),
+                "p50_ms": p50 * 1000,
+                "p95_ms": p95 * 1000,
+            })
+        return rows
+
+    def render_prometheus(self, **const_labels) -> str:
+        """Teks Prometheus; `const_labels` (mis. pid) ditambahkan ke setiap seri."""
+        name = f"{METRICS_PREFIX}_stage_duration_seconds"
+        const = tuple(sorted((k, str(v)) for k, v in const_labels.items()))
+        lines = [
+            f"# HELP {name} Durasi tiap tahap aplikasi (detik).",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        for key, hist in histograms:
+            key = key + const
+            cumulative = np.cumsum(hist.counts)
+            for bound, count in zip(LATENCY_BUCKETS, cumulative):
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_labels(key, le)} {int(count)}")
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{_labels(key, le)} {hist.n}")
+            lines.append(f"{name}_sum{_labels(key)} {hist.total:.6f}")
+            lines.append(f"{name}_count{_labels(key)} {hist.n}")
+
+        declared = set()
+        for (counter, labels), value in counters:
+            full = f"{METRICS_PREFIX}_{counter}"
+            if full not in declared:
+                lines.append(f"# TYPE {full} counter")
+                declared.add(full)
+            lines.append(f"{full}{_labels(labels + const)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[Path] = None) -> bool:
+        """Tulis snapshot proses ini ke file (atomik: file sementara lalu `os.replace`).
+
+        Default `metrics_path()`, satu file per proses berlabel `pid`, untuk
+        dibaca scraper lokal / node_exporter textfile collector.
+        """
+        pid = os.getpid()
+        path = Path(path or metrics_path(pid))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if self._pruned_pid != pid:
+                self._pruned_pid = pid
+                prune_metrics_files(path.parent)
+            # Nama sementara tidak cocok dengan METRICS_GLOB, jadi tidak ikut dibaca collector.
+            tmp = path.with_name(f".{path.name}.{pid}.{threading.get_ident()}.tmp")
+            tmp.write_text(self.render_prometheus(pid=pid), encoding="utf-8")
+            os.replace(tmp, path)
+            return True
+        except OSError:
+            return False
+
+REGISTRY = MetricsRegistry()
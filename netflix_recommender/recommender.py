@@ -0,0 +1,173 @@
+"""Objek `Recommender`: load -> prepare -> fit/load artefak -> query, tanpa Streamlit.
+
+Worker serving yang hanya memuat artefak di disk tidak mengimpor scikit-learn;
+fit (dan impornya) baru terjadi bila artefak untuk dataset itu belum ada.
+
+    from netflix_recommender import Recommender
+    rec = Recommender.load("netflix_titles.csv")
+    rec.search("crime drama", top_n=5, type_filter="TV Show")
+    rec.similar(rec.index_of("s1"), top_n=5)
+"""
+import io
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    MetadataIndex,
+    _file_format,
+    build_inverted_index,
+    build_vectorizer_and_matrix,
+    compact_frame,
+    compute_neighbor_table,
+    dataset_fingerprint,
+    load_artifacts,
+    prepare_data,
+    read_catalog,
+    recommend_by_index,
+    recommend_by_profile,
+    recommend_by_query,
+    save_artifacts,
+)
+from netflix_recommender.fields import FieldModel
+
+class Recommender:
+    """Frame siap pakai + vectorizer + matriks TF-IDF (+ tabel tetangga) satu versi dataset."""
+
+    def __init__(self, df: pd.DataFrame, vectorizer, tfidf_matrix, neighbors=None,
+                 fingerprint: Optional[str] = None):
+        self.df = df
+        self.vectorizer = vectorizer
+        self.tfidf_matrix = tfidf_matrix
+        self.neighbors = neighbors
+        self.fingerprint = fingerprint
+        self._meta_index = None
+        self._inverted_index = None
+        self._field_model = None
+        self._show_ids = None
+
+    @classmethod
+    def from_artifacts(cls, fingerprint: str) -> Optional["Recommender"]:
+        """Jalur serving: hanya artefak di disk (tanpa fit); None bila belum ada."""
+        artifacts = load_artifacts(fingerprint)
+        if artifacts is None:
+            return None
+        return cls(*artifacts, fingerprint=fingerprint)
+
+    @classmethod
+    def fit(cls, raw: pd.DataFrame, fingerprint: Optional[str] = None,
+            neighbor_k: Optional[int] = None, workers: int = 1) -> Optional["Recommender"]:
+        """prepare_data + fit TF-IDF (+ tabel tetangga bila `neighbor_k`); None bila dataset kosong.
+
+        Setelah fit frame disimpan sebagai `compact_frame` (tanpa `soup`). Tabel
+        tetangga O(N²) sebaiknya dibangun offline (`python -m netflix_recommender.batch
+        --neighbor-table`); tanpa tabel, `similar` menskor live.
+        """
+        df = prepare_data(raw)
+        if df.empty:
+            return None
+        vectorizer, tfidf_matrix = build_vectorizer_and_matrix(df["soup"], workers=workers)
+        if tfidf_matrix is None:
+            return None
+        neighbors = compute_neighbor_table(tfidf_matrix, k=neighbor_k) if neighbor_k else None
+        return cls(compact_frame(df), vectorizer, tfidf_matrix, neighbors, fingerprint=fingerprint)
+
+    @classmethod
+    def load(
+        cls,
+        source: Union[str, Path, bytes] = DEFAULT_DATA_PATH,
+        fmt: Optional[str] = None,
+        use_artifacts: bool = True,
+        save: bool = True,
+        neighbor_k: Optional[int] = None,
+        workers: int = 1,
+    ) -> Optional["Recommender"]:
+        """Artefak di disk bila ada; kalau tidak baca dataset, fit, lalu simpan artefaknya.
+
+        `source` berupa path atau isi file (bytes, wajib `fmt`: csv/parquet/feather).
+        Tabel tetangga dipakai bila artefak sudah memilikinya (dibangun job batch).
+        """
+        if isinstance(source, str):
+            source = Path(source)
+        fingerprint = dataset_fingerprint(source)
+        if use_artifacts:
+            rec = cls.from_artifacts(fingerprint)
+            if rec is not None:
+                return rec
+
+        if isinstance(source, Path):
+            fmt = fmt or _file_format(str(source))
+        else:
+            source = io.BytesIO(source)
+        rec = cls.fit(read_catalog(source, fmt or "csv"), fingerprint=fingerprint,
+                      neighbor_k=neighbor_k, workers=workers)
+        if rec is not None and save:
+            save_artifacts(fingerprint, rec.df, rec.vectorizer, rec.tfidf_matrix, rec.neighbors)
+        return rec
+
+    @property
+    def meta_index(self) -> MetadataIndex:
+        if self._meta_index is None:
+            self._meta_index = MetadataIndex.build(self.df)
+        return self._meta_index
+
+    @property
+    def inverted_index(self):
+        if self._inverted_index is None:
+            self._inverted_index = build_inverted_index(self.tfidf_matrix)
+        return self._inverted_index
+
+    @property
+    def field_model(self) -> FieldModel:
+        if self._field_model is None:
+            self._field_model = FieldModel.build(self.df, self.vectorizer)
+        return self._field_model
+
+    def _field_scorer(self, field_weights: Optional[dict]):
+        return None if field_weights is None else self.field_model.weighted(field_weights)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def index_of(self, show_id: str) -> Optional[int]:
+        """Posisi baris untuk `show_id`, atau None."""
+        if self._show_ids is None:
+            self._show_ids = pd.Index(self.df["show_id"].astype(str))
+        pos = self._show_ids.get_indexer([str(show_id)])[0]
+        return None if pos < 0 else int(pos)
+
+    def similar(self, idx: int, top_n: int = 10, same_type: bool = True,
+                year_min: Optional[int] = None, year_max: Optional[int] = None,
+                field_weights: Optional[dict] = None, **kwargs) -> pd.DataFrame:
+        """Judul serupa dengan baris `idx` (lihat `recommend_by_index`).
+
+        `field_weights` (mis. {"director": 3, "description": 0.5}) menskor lewat
+        blok TF-IDF per field; field yang tidak disebut berbobot 1.
+        """
+        return recommend_by_index(
+            idx, self.df, self.tfidf_matrix, top_n=top_n, same_type=same_type,
+            year_min=year_min, year_max=year_max, neighbors=self.neighbors, inverted_index=self.inverted_index,
+            meta_index=self.meta_index, field_scorer=self._field_scorer(field_weights), **kwargs,
+        )
+
+    def profile(self, liked, disliked=(), top_n: int = 10, same_type: bool = True,
+                year_min: Optional[int] = None, year_max: Optional[int] = None,
+                field_weights: Optional[dict] = None, **kwargs) -> pd.DataFrame:
+        """Judul untuk profil beberapa baris yang disukai (& opsional tidak disukai), lihat `recommend_by_profile`."""
+        return recommend_by_profile(
+            liked, self.df, self.tfidf_matrix, top_n=top_n, negative_seeds=disliked, same_type=same_type,
+            year_min=year_min, year_max=year_max, meta_index=self.meta_index,
+            inverted_index=self.inverted_index, field_scorer=self._field_scorer(field_weights), **kwargs,
+        )
+
+    def search(self, query: str, top_n: int = 10, type_filter: str = "All",
+               year_min: Optional[int] = None, year_max: Optional[int] = None,
+               field_weights: Optional[dict] = None, **kwargs) -> pd.DataFrame:
+        """Judul paling relevan untuk kata kunci (lihat `recommend_by_query` dan `similar`)."""
+        return recommend_by_query(
+            query, self.df, self.vectorizer, self.tfidf_matrix, top_n=top_n, type_filter=type_filter,
+            year_min=year_min, year_max=year_max, inverted_index=self.inverted_index,
+            meta_index=self.meta_index, field_scorer=self._field_scorer(field_weights), **kwargs,
+        )
@@ -0,0 +1,173 @@
+"""Indeks pencarian judul untuk kotak pilih judul (prefix + trigram).
+
+Judul dinormalisasi (huruf kecil, non-alfanumerik -> spasi). Setiap awal kata
+menyumbang satu sufiks ke array terurut, sehingga query yang cocok di awal kata
+cukup dicari dengan dua binary search. Query yang muncul di tengah kata dicari
+lewat postings trigram (kode trigram int64 -> baris), lalu diverifikasi.
+
+Hasil diurutkan: judul persis, awalan judul, awalan kata, lalu substring;
+di dalam tiap kelas judul yang lebih pendek lebih dulu.
+"""
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+TITLE_OPTIONS_LIMIT = 50
+
+# Batas atas kode Unicode; `q + _MAX_CHAR` membatasi rentang sufiks berawalan q.
+_MAX_CHAR = "\U0010ffff"
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+def _normalize_query(query: str) -> str:
+    return _NON_WORD.sub(" ", str(query).lower()).strip()
+
+def normalize_titles(titles) -> pd.Series:
+    # Fungsi yang sama dengan query (bukan .str.lower Arrow) agar huruf seperti "İ"
+    # dinormalisasi identik di indeks dan di kotak pencarian.
+    return pd.Series(titles, dtype=object).fillna("").map(_normalize_query)
+
+def _trigram_codes(codes: np.ndarray) -> np.ndarray:
+    # Tiga code point (masing-masing <= 21 bit) dipadatkan ke satu int64.
+    codes = codes.astype(np.int64)
+    return (codes[:-2] << 42) | (codes[1:-1] << 21) | codes[2:]
+
+def _utf32(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+class TitleIndex:
+    """Indeks prefix (sufiks awal kata terurut) + postings trigram atas judul ter-normalisasi."""
+
+    def __init__(self, titles: np.ndarray, lengths: np.ndarray, word_keys: np.ndarray,
+                 word_rows: np.ndarray, word_first: np.ndarray, trigram_keys: np.ndarray,
+                 trigram_offsets: np.ndarray, trigram_rows: np.ndarray):
+        self.titles = titles
+        self.lengths = lengths
+        self.word_keys = word_keys
+        self.word_rows = word_rows
+        self.word_first = word_first
+        self.trigram_keys = trigram_keys
+        self.trigram_offsets = trigram_offsets
+        self.trigram_rows = trigram_rows
+
+    @classmethod
+    def build(cls, titles) -> "TitleIndex":
+        norm = normalize_titles(titles).to_numpy(dtype=object)
+        lengths = np.fromiter((len(t) for t in norm), dtype=np.int32, count=len(norm))
+
+        keys, rows, first = [], [], []
+        for row, title in enumerate(norm):
+            pos = 0
+            for word in title.split(" "):
+                if word:
+                    keys.append(title[pos:])
+                    rows.append(row)
+                    first.append(pos == 0)
+                pos += len(word) + 1
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        word_keys = np.array([keys[i] for i in order], dtype=object)
+        word_rows = np.asarray(rows, dtype=np.int32)[order] if order else np.empty(0, dtype=np.int32)
+        word_first = np.asarray(first, dtype=bool)[order] if order else np.empty(0, dtype=bool)
+
+        # Trigram: semua judul digabung dengan pemisah \0; trigram yang melewati
+        # batas judul (atau memuat pemisah) dibuang.
+        codes = _utf32("\0".join(norm) + "\0")
+        char_rows = np.repeat(np.arange(len(norm), dtype=np.int32), lengths + 1)
+        if len(codes) >= 3:
+            valid = (char_rows[:-2] == char_rows[2:]) & (codes[2:] != 0)
+            tri = _trigram_codes(codes)[valid]
+            tri_rows = char_rows[:-2][valid]
+            order = np.lexsort((tri_rows, tri))
+            tri, tri_rows = tri[order], tri_rows[order]
+            keep = np.ones(len(tri), dtype=bool)
+            keep[1:] = (tri[1:] != tri[:-1]) | (tri_rows[1:] != tri_rows[:-1])
+            tri, tri_rows = tri[keep], tri_rows[keep]
+        else:
+            tri, tri_rows = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        trigram_keys, starts = np.unique(tri, return_index=True)
+
+        return cls(
+            titles=norm,
+            lengths=lengths,
+            word_keys=word_keys,
+            word_rows=word_rows,
+            word_first=word_first,
+            trigram_keys=trigram_keys,
+            trigram_offsets=np.append(starts, len(tri)).astype(np.int64),
+            trigram_rows=tri_rows,
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _postings(self, key: int) -> np.ndarray:
+        pos = np.searchsorted(self.trigram_keys, key)
+        if pos == len(self.trigram_keys) or self.trigram_keys[pos] != key:
+            return np.empty(0, dtype=np.int32)
+        return self.trigram_rows[self.trigram_offsets[pos] : self.trigram_offsets[pos + 1]]
+
+    def _substring_rows(self, q: str, allowed: Optional[np.ndarray], exclude: np.ndarray,
+                        limit: int) -> np.ndarray:
+        keys = np.unique(_trigram_codes(_utf32(q)))
+        postings = sorted((self._postings(k) for k in keys), key=len)
+        cand = postings[0]
+        for p in postings[1:]:
+            if len(cand) == 0:
+                break
+            cand = np.intersect1d(cand, p, assume_unique=True)
+        if allowed is not None:
+            cand = cand[allowed[cand]]
+        cand = np.setdiff1d(cand, exclude, assume_unique=True)
+        # Trigram cocok belum tentu berurutan: verifikasi substring, judul terpendek dulu.
+        cand = cand[np.argsort(self.lengths[cand], kind="stable")]
+        out = []
+        for row in cand:
+            if q in self.titles[row]:
+                out.append(row)
+                if len(out) >= limit:
+                    break
+        return np.asarray(out, dtype=np.int32)
+
+    def _top_ranked(self, rows: np.ndarray, first: np.ndarray, q_len: int, limit: int) -> np.ndarray:
+        # Kunci urut dipadatkan ke int64: kelas (0 = judul persis, 1 = awalan judul,
+        # 2 = awalan kata lain) | panjang judul | baris. Hanya `limit` terkecil diurutkan.
+        lengths = self.lengths[rows].astype(np.int64)
+        klass = np.where(first, np.where(lengths == q_len, 0, 1), 2).astype(np.int64)
+        keys = (klass << 60) | (lengths << 32) | rows.astype(np.int64)
+        if len(keys) > limit:
+            part = np.partition(keys, limit - 1)[:limit]
+            top = np.unique(part & 0xFFFFFFFF)
+            if len(top) == limit:
+                keys = part
+        keys = np.sort(keys)
+        ranked = (keys & 0xFFFFFFFF).astype(np.int32)
+        # Judul dengan beberapa kata berawalan q muncul sekali saja (posisi terbaiknya).
+        _, first_seen = np.unique(ranked, return_index=True)
+        return ranked[np.sort(first_seen)][:limit]
+
+    def search(self, query: str, limit: int = TITLE_OPTIONS_LIMIT,
+               allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """Posisi baris (maks. `limit`) yang judulnya memuat `query`, terurut relevansi.
+
+        `allowed` = mask boolean baris yang boleh muncul (mis. filter tipe).
+        Query kosong mengembalikan `limit` baris pertama yang diizinkan.
+        """
+        q = _normalize_query(query)
+        if not q:
+            rows = np.arange(len(self), dtype=np.int32) if allowed is None else np.flatnonzero(allowed)
+            return rows[:limit]
+
+        lo = np.searchsorted(self.word_keys, q, side="left")
+        hi = np.searchsorted(self.word_keys, q + _MAX_CHAR, side="left")
+        rows, first = self.word_rows[lo:hi], self.word_first[lo:hi]
+        if allowed is not None:
+            keep = allowed[rows]
+            rows, first = rows[keep], first[keep]
+        rows = self._top_ranked(rows, first, len(q), limit)
+
+        if len(rows) < limit and len(q) >= 3:
+            extra = self._substring_rows(q, allowed, np.sort(rows), limit - len(rows))
+            rows = np.concatenate([rows, extra])
+        return rows
@@ -0,0 +1,46 @@
+"""Fit TF-IDF paralel (`workers` > 1) vs serial pada korpus kecil.
+
+Jalur paralel (potong per worker, gabung vocabulary & df) harus memberi
+vocabulary, idf dan matriks yang sama dengan `TfidfVectorizer.fit_transform`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    FrozenTfidfVectorizer,
+    PARALLEL_FIT_MIN_ROWS,
+    build_vectorizer_and_matrix,
+    prepare_data,
+)
+
+N_DOCS = 600
+
+@pytest.fixture(scope="module")
+def corpus() -> pd.Series:
+    return prepare_data(pd.read_csv(DEFAULT_DATA_PATH, nrows=N_DOCS))["soup"]
+
+# =========================================================
+# TESTS
+# =========================================================
+def test_parallel_fit_matches_serial(corpus):
+    serial_vec, serial = build_vectorizer_and_matrix(corpus, workers=1, budget_mb=0)
+    # min_rows=0 memaksa jalur paralel walau korpus kecil.
+    parallel_vec, parallel = build_vectorizer_and_matrix(corpus, workers=2, budget_mb=0, min_rows=0)
+
+    assert isinstance(parallel_vec, FrozenTfidfVectorizer)
+    assert dict(parallel_vec.vocabulary_) == dict(serial_vec.vocabulary_)
+    np.testing.assert_allclose(parallel_vec.idf_, serial_vec.idf_, rtol=1e-12)
+
+    # Urutan kolom dalam baris boleh beda (sklearn tidak mengurutkan indices).
+    serial, parallel = serial.sorted_indices(), parallel.sorted_indices()
+    assert parallel.shape == serial.shape
+    np.testing.assert_array_equal(parallel.indptr, serial.indptr)
+    np.testing.assert_array_equal(parallel.indices, serial.indices)
+    np.testing.assert_allclose(parallel.data, serial.data, rtol=1e-6)
+
+def test_small_corpus_stays_serial(corpus):
+    assert len(corpus) < PARALLEL_FIT_MIN_ROWS
+    vectorizer, _ = build_vectorizer_and_matrix(corpus, workers=2, budget_mb=0)
+    assert not isinstance(vectorizer, FrozenTfidfVectorizer)
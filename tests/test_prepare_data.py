@@ -0,0 +1,175 @@
+"""`prepare_data` vektor vs salinan beku versi per baris (sebelum vektorisasi).
+
+`_legacy_prepare_data` adalah `prepare_data` lama apa adanya (apply/map per
+baris); versi sekarang harus menghasilkan frame yang sama persis, termasuk
+`soup` (dokumen TF-IDF) dan `display_title`.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from netflix_recommender.core import (
+    DEFAULT_DATA_PATH,
+    _display_titles,
+    _file_format,
+    build_soup,
+    compact_frame,
+    prepare_data,
+    read_catalog,
+)
+
+# =========================================================
+# SALINAN BEKU: prepare_data per baris
+# =========================================================
+def _legacy_normalize_text(x: object) -> str:
+    if x is None:
+        return ""
+    if isinstance(x, float) and np.isnan(x):
+        return ""
+    s = str(x).strip()
+    if s.lower() in {"unknown", "nan", "none", "null", ""}:
+        return ""
+    s = s.replace("&", " and ")
+    s = s.lower()
+    s = re.sub(r"[^0-9a-z]+", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+def _legacy_prepare_data(raw: pd.DataFrame) -> pd.DataFrame:
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+
+    df = raw.copy()
+    df.columns = df.columns.str.strip().str.lower()
+
+    mapping = {
+        "show id": "show_id",
+        "show_id": "show_id",
+        "type": "type",
+        "title": "title",
+        "director": "director",
+        "cast": "cast",
+        "country": "country",
+        "date_added": "date_added",
+        "release year": "release_year",
+        "release_year": "release_year",
+        "rating": "rating",
+        "duration": "duration",
+        "listed in": "listed_in",
+        "listed_in": "listed_in",
+        "description": "description",
+    }
+
+    for old_name, new_name in mapping.items():
+        if old_name in df.columns and new_name not in df.columns:
+            df[new_name] = df[old_name]
+
+    expected = ["show_id","type","title","director","cast","country","release_year","rating","duration","listed_in","description"]
+    for col in expected:
+        if col not in df.columns:
+            df[col] = ""
+
+    df["type"] = df["type"].astype(str).str.strip()
+    df["type"] = df["type"].apply(lambda x: "TV Show" if str(x).lower() == "tv show" else x)
+    df["type"] = df["type"].apply(lambda x: "Movie" if str(x).lower() == "movie" else x)
+
+    text_cols = ["type","title","director","cast","country","rating","duration","listed_in","description"]
+    for c in text_cols:
+        df[c] = df[c].fillna("").astype(str)
+        df[c] = df[c].replace({"unknown": "", "Unknown": "", "nan": "", "NaN": "", "None": "", "none": ""})
+
+    df["release_year"] = pd.to_numeric(df["release_year"], errors="coerce").fillna(0).astype(int)
+
+    df["soup"] = (
+        df["title"].map(_legacy_normalize_text)
+        + " " + df["type"].map(_legacy_normalize_text)
+        + " " + df["director"].map(_legacy_normalize_text)
+        + " " + df["cast"].map(_legacy_normalize_text)
+        + " " + df["country"].map(_legacy_normalize_text)
+        + " " + df["listed_in"].map(_legacy_normalize_text)
+        + " " + df["rating"].map(_legacy_normalize_text)
+        + " " + df["description"].map(_legacy_normalize_text)
+    ).str.strip()
+
+    df["display_title"] = df["title"].astype(str) + " (" + df["type"].astype(str) + ", " + df["release_year"].astype(str) + ")"
+
+    dup = df["display_title"].duplicated(keep=False)
+    if dup.any():
+        df.loc[dup, "display_title"] = df.loc[dup].apply(
+            lambda r: f"{r['title']} ({r['type']}, {r['release_year']}) — {r.get('show_id','')}",
+            axis=1,
+        )
+
+    if df["show_id"].astype(str).duplicated().any():
+        df["show_id"] = df.apply(lambda r: f"{r.get('show_id','')}_{r.name}", axis=1)
+
+    return df
+
+# =========================================================
+# HELPERS
+# =========================================================
+def assert_same_frame(new: pd.DataFrame, old: pd.DataFrame) -> None:
+    # Nilai sel harus identik; dtype string boleh beda (object vs str).
+    assert list(new.columns) == list(old.columns)
+    pd.testing.assert_frame_equal(new, old, check_dtype=False)
+
+@pytest.fixture(scope="module")
+def raw_catalog() -> pd.DataFrame:
+    return pd.read_csv(DEFAULT_DATA_PATH)
+
+def _edge_catalog() -> pd.DataFrame:
+    return pd.DataFrame({
+        "show_id": ["s1", "s2", "s3", "s4", "s4", "s6", "s7"],
+        "type": [" movie", "TV SHOW", "Movie", "tv show", None, "Movie", "Documentary"],
+        "title": ["Dup", "Dup", "Dup", "Ümlaut & Co.", "", "nan", "İstanbul"],
+        "director": [np.nan, "", "  ", "Unknown", "None", "Jean-Luc Godard", "NULL"],
+        "cast": [np.nan, "", "A, B", "unknown", "null", "  X  &  Y  ", None],
+        "country": ["United States", np.nan, "", "France, Germany", "NaN", "Japan", "Turkey"],
+        "date_added": ["September 25, 2021", "not a date", "", np.nan, "2021-13-45", " August 4, 2020", "31/02/2019"],
+        "release_year": [2020, 2020, 2020, "1999", "n/a", np.nan, 2019.0],
+        "rating": ["PG-13", "TV-MA", np.nan, "Unknown", "R", "", "TV-14"],
+        "duration": ["90 min", "1 Season", "90 min", np.nan, "", "2 Seasons", "45 min"],
+        "listed_in": ["Dramas", "Comedies, Dramas", "Dramas", "", np.nan, "Documentaries", "Docuseries"],
+        "description": ["A film.", "A show!", "Same title, different year?", "Café & crème", "", "nan", "Şehir"],
+    })
+
+# =========================================================
+# TESTS
+# =========================================================
+def test_matches_legacy_on_catalog(raw_catalog):
+    assert_same_frame(prepare_data(raw_catalog), _legacy_prepare_data(raw_catalog))
+
+def test_matches_legacy_on_ingested_catalog(raw_catalog):
+    # Jalur app: read_catalog membaca type/rating sebagai category.
+    # Kolom yang tidak dipakai (mis. date_added) tidak ikut dibaca, jadi bandingkan kolom yang ada.
+    path = str(DEFAULT_DATA_PATH)
+    new = prepare_data(read_catalog(path, _file_format(path)))
+    assert_same_frame(new, _legacy_prepare_data(raw_catalog)[new.columns])
+
+def test_matches_legacy_on_edge_cases():
+    raw = _edge_catalog()
+    new, old = prepare_data(raw), _legacy_prepare_data(raw)
+    assert_same_frame(new, old)
+    # Judul kembar dibedakan lewat show_id, show_id kembar diberi akhiran indeks.
+    assert new["display_title"].is_unique
+    assert new["show_id"].is_unique
+    # date_added tidak disentuh, termasuk nilai yang tidak bisa di-parse.
+    pd.testing.assert_series_equal(new["date_added"], raw["date_added"])
+
+def test_matches_legacy_on_renamed_and_missing_columns():
+    raw = _edge_catalog().rename(columns={"show_id": "Show ID", "release_year": " Release Year", "listed_in": "Listed In"})
+    raw = raw.drop(columns=["cast", "description"])
+    assert_same_frame(prepare_data(raw), _legacy_prepare_data(raw))
+
+def test_empty_frame():
+    assert prepare_data(pd.DataFrame()).empty
+    assert prepare_data(None).empty
+
+def test_compact_frame_rebuilds_soup_and_titles(raw_catalog):
+    old = _legacy_prepare_data(raw_catalog)
+    compact = compact_frame(prepare_data(raw_catalog))
+    assert "soup" not in compact.columns and "display_title" not in compact.columns
+    assert build_soup(compact).tolist() == old["soup"].tolist()
+    assert _display_titles(compact).tolist() == old["display_title"].tolist()